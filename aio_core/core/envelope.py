@@ -7,11 +7,88 @@ regardless of whether it came from an AIO file or was scraped from HTML.
 
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
+import hashlib
 import json
+import operator
+import sys
+from sys import intern
 
+# Optional: orjson serializes several times faster than the stdlib encoder
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-@dataclass
+# Optional: tiktoken gives exact BPE token counts instead of the chars/4 guess
+try:
+    import tiktoken
+    HAS_TIKTOKEN = True
+except ImportError:
+    HAS_TIKTOKEN = False
+
+# slots=True drops the per-instance __dict__ (Python 3.10+); envelopes with
+# hundreds of ChunkIndex entries otherwise carry one dict per chunk
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Narratives at least this long are streamed by ContentEnvelope.dump_to(),
+# encoded STREAM_CHUNK_SIZE characters at a time
+STREAM_THRESHOLD = 64 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Longer texts use the chars/4 estimate even when tiktoken is available
+EXACT_TOKEN_LIMIT = 100 * 1024
+
+_encoding = None
+
+
+def make_envelope_id(prefix: str, source_url: str) -> str:
+    """
+    Build a deterministic envelope ID from a source URL.
+    
+    Uses a 128-bit BLAKE2b digest so IDs are stable across processes
+    (unlike the randomized builtin hash()) and safe to use as cache keys.
+    """
+    digest = hashlib.blake2b(source_url.encode("utf-8"), digest_size=16).hexdigest()
+    return f"{prefix}-{digest}"
+
+
+def hash_narrative(narrative: str) -> str:
+    """SHA-256 of the narrative, in the spec's "sha256:<hex>" format."""
+    return f"sha256:{hashlib.sha256(narrative.encode('utf-8')).hexdigest()}"
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Token count for a narrative.
+    
+    Exact cl100k_base count when tiktoken is installed and the text is under
+    EXACT_TOKEN_LIMIT characters; otherwise the rough ~4 chars per token.
+    """
+    global _encoding
+    if HAS_TIKTOKEN and len(text) < EXACT_TOKEN_LIMIT:
+        if _encoding is None:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        return len(_encoding.encode(text, disallowed_special=()))
+    return len(text) // 4
+
+
+def _dumps(obj) -> bytes:
+    """Compact JSON encoding as UTF-8 bytes."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _json_default(obj):
+    """orjson fallback for dataclass fields: datetimes as isoformat(), as in to_dict()."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ChunkIndex:
     """Index entry for a content chunk."""
     id: str
@@ -25,7 +102,7 @@ class ChunkIndex:
     related: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Entity:
     """Structured entity extracted from content."""
     type: str  # e.g., "PriceSpecification", "Product", "Organization"
@@ -34,7 +111,7 @@ class Entity:
     binding_confidence: float = 1.0
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class IntegrityInfo:
     """Cryptographic integrity information."""
     narrative_hash: Optional[str] = None
@@ -43,7 +120,25 @@ class IntegrityInfo:
     verified_at: Optional[datetime] = None
 
 
-@dataclass
+# Serialized field names; attrgetter fetches them all in one C call per object
+_CHUNK_KEYS = (
+    "id", "path", "title", "keywords", "summary", "content_type",
+    "token_estimate", "priority", "related",
+)
+_ENTITY_KEYS = ("type", "properties", "anchor_ref", "binding_confidence")
+_chunk_attrs = operator.attrgetter(*_CHUNK_KEYS)
+_entity_attrs = operator.attrgetter(*_ENTITY_KEYS)
+
+
+def _chunk_dict(c: ChunkIndex) -> dict:
+    return dict(zip(_CHUNK_KEYS, _chunk_attrs(c)))
+
+
+def _entity_dict(e: Entity) -> dict:
+    return dict(zip(_ENTITY_KEYS, _entity_attrs(e)))
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ContentEnvelope:
     """
     Unified content envelope - the output of AIO parsing.
@@ -75,9 +170,13 @@ class ContentEnvelope:
     integrity: IntegrityInfo = field(default_factory=IntegrityInfo)
     
     # Metadata
-    fetched_at: datetime = field(default_factory=datetime.utcnow)
+    fetched_at: Optional[datetime] = None  # set to now (UTC) in __post_init__
     aio_version: Optional[str] = None
     
+    def __post_init__(self):
+        if self.fetched_at is None:
+            self.fetched_at = datetime.now(timezone.utc)
+    
     def to_dict(self) -> dict:
         """Convert envelope to dictionary for JSON serialization."""
         return {
@@ -89,37 +188,136 @@ class ContentEnvelope:
             "tokens": self.tokens,
             "noise_score": self.noise_score,
             "relevance_ratio": self.relevance_ratio,
-            "chunks": [
-                {
-                    "id": c.id,
-                    "path": c.path,
-                    "title": c.title,
-                    "keywords": c.keywords,
-                    "summary": c.summary,
-                    "token_estimate": c.token_estimate,
-                }
-                for c in self.chunks
-            ],
-            "entities": [
-                {
-                    "type": e.type,
-                    "properties": e.properties,
-                    "anchor_ref": e.anchor_ref,
-                }
-                for e in self.entities
-            ],
-            "integrity": {
-                "verified": self.integrity.verified,
-                "signature_valid": self.integrity.signature_valid,
-            },
+            "chunks": [_chunk_dict(c) for c in self.chunks],
+            "entities": [_entity_dict(e) for e in self.entities],
+            "integrity": self._integrity_dict(),
             "fetched_at": self.fetched_at.isoformat(),
             "aio_version": self.aio_version,
         }
     
+    def _integrity_dict(self) -> dict:
+        verified_at = self.integrity.verified_at
+        return {
+            "narrative_hash": self.integrity.narrative_hash,
+            "verified": self.integrity.verified,
+            "signature_valid": self.integrity.signature_valid,
+            "verified_at": verified_at.isoformat() if verified_at else None,
+        }
+    
     def to_json(self, indent: int = 2) -> str:
         """Serialize envelope to JSON string."""
+        # orjson only supports 2-space indentation; other widths use stdlib json.
+        # orjson walks the dataclasses directly (field order matches to_dict()),
+        # so no dict copy is built
+        if HAS_ORJSON and indent in (None, 0, 2):
+            option = orjson.OPT_PASSTHROUGH_DATETIME | (orjson.OPT_INDENT_2 if indent else 0)
+            return orjson.dumps(self, default=_json_default, option=option).decode("utf-8")
         return json.dumps(self.to_dict(), indent=indent)
     
+    def dump_to(self, fp) -> None:
+        """
+        Write the envelope as compact JSON (UTF-8) to a binary file-like object.
+        
+        Large envelopes are written piece by piece - header, then each chunk
+        and entity, then the narrative last in STREAM_CHUNK_SIZE slices - so
+        neither the document nor the narrative is ever encoded as one buffer.
+        Small envelopes are encoded in one call.
+        """
+        if len(self.narrative) < STREAM_THRESHOLD:
+            fp.write(_dumps(self.to_dict()))
+            return
+        
+        # Same fields as to_dict(), minus the three potentially large ones
+        header = _dumps({
+            "id": self.id,
+            "source_url": self.source_url,
+            "source_type": self.source_type,
+            "format": self.format,
+            "tokens": self.tokens,
+            "noise_score": self.noise_score,
+            "relevance_ratio": self.relevance_ratio,
+            "integrity": self._integrity_dict(),
+            "fetched_at": self.fetched_at.isoformat(),
+            "aio_version": self.aio_version,
+        })
+        fp.write(header[:-1])  # reopen the header object
+        fp.write(b',"chunks":[')
+        for i, chunk in enumerate(self.chunks):
+            if i:
+                fp.write(b",")
+            fp.write(_dumps(_chunk_dict(chunk)))
+        fp.write(b'],"entities":[')
+        for i, entity in enumerate(self.entities):
+            if i:
+                fp.write(b",")
+            fp.write(_dumps(_entity_dict(entity)))
+        fp.write(b'],"narrative":"')
+        # JSON escapes are per character, so each slice encodes independently;
+        # [1:-1] strips the slice's own quotes
+        narrative = self.narrative
+        for start in range(0, len(narrative), STREAM_CHUNK_SIZE):
+            fp.write(_dumps(narrative[start:start + STREAM_CHUNK_SIZE])[1:-1])
+        fp.write(b'"}')
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ContentEnvelope":
+        """
+        Rebuild an envelope from the output of to_dict().
+
+        to_dict() emits every field, so the round trip is lossless; fields
+        missing from older output fall back to their defaults.
+        """
+        integrity = data.get("integrity") or {}
+        fetched_at = data.get("fetched_at")
+        verified_at = integrity.get("verified_at")
+
+        return cls(
+            id=data["id"],
+            source_url=data["source_url"],
+            source_type=data["source_type"],
+            narrative=data["narrative"],
+            format=data.get("format", "markdown"),
+            tokens=data.get("tokens", 0),
+            noise_score=data.get("noise_score", 0.0),
+            relevance_ratio=data.get("relevance_ratio", 1.0),
+            chunks=[
+                ChunkIndex(
+                    id=c["id"],
+                    path=c.get("path", ""),
+                    title=c.get("title", ""),
+                    keywords=c.get("keywords", []),
+                    summary=c.get("summary", ""),
+                    content_type=c.get("content_type", "article"),
+                    token_estimate=c.get("token_estimate", 0),
+                    priority=c.get("priority", 0.5),
+                    related=c.get("related", []),
+                )
+                for c in data.get("chunks", [])
+            ],
+            entities=[
+                Entity(
+                    type=e["type"],
+                    properties=e.get("properties", {}),
+                    anchor_ref=e.get("anchor_ref"),
+                    binding_confidence=e.get("binding_confidence", 1.0),
+                )
+                for e in data.get("entities", [])
+            ],
+            integrity=IntegrityInfo(
+                narrative_hash=integrity.get("narrative_hash"),
+                verified=integrity.get("verified", False),
+                signature_valid=integrity.get("signature_valid"),
+                verified_at=datetime.fromisoformat(verified_at) if verified_at else None,
+            ),
+            fetched_at=datetime.fromisoformat(fetched_at) if fetched_at else None,
+            aio_version=data.get("aio_version"),
+        )
+
+    @classmethod
+    def from_json(cls, data) -> "ContentEnvelope":
+        """Deserialize an envelope produced by to_json() (str or bytes)."""
+        return cls.from_dict(orjson.loads(data) if HAS_ORJSON else json.loads(data))
+
     @classmethod
     def from_aio(cls, aio_data: dict, source_url: str, chunk_id: Optional[str] = None) -> "ContentEnvelope":
         """
@@ -130,16 +328,17 @@ class ContentEnvelope:
             source_url: Original URL requested
             chunk_id: Optional specific chunk to extract (if None, returns all)
         """
-        # Build chunk index
+        # Build chunk index. Keywords and content types come from a small
+        # vocabulary repeated across chunks, so intern them to share one copy
         chunks = []
         for idx in aio_data.get("index", []):
             chunks.append(ChunkIndex(
                 id=idx["id"],
                 path=idx.get("path", ""),
                 title=idx.get("title", ""),
-                keywords=idx.get("keywords", []),
+                keywords=[intern(k) for k in idx.get("keywords", ())],
                 summary=idx.get("summary", ""),
-                content_type=idx.get("content_type", "article"),
+                content_type=intern(idx.get("content_type", "article")),
                 token_estimate=idx.get("token_estimate", 0),
                 priority=idx.get("priority", 0.5),
                 related=idx.get("related", []),
@@ -149,23 +348,18 @@ class ContentEnvelope:
         content_items = aio_data.get("content", [])
         
         if chunk_id:
-            # Get specific chunk
-            matching = [c for c in content_items if c["id"] == chunk_id]
-            if matching:
-                narrative = matching[0].get("content", "")
-            else:
-                narrative = ""
+            # Get specific chunk (first match only)
+            match = next((c for c in content_items if c["id"] == chunk_id), None)
+            narrative = match.get("content", "") if match else ""
         else:
-            # Combine all content
-            narrative = "\n\n---\n\n".join(
-                c.get("content", "") for c in content_items
-            )
+            # Combine all content from a prebuilt list (join sizes it in one pass)
+            parts = [c["content"] if "content" in c else "" for c in content_items]
+            narrative = parts[0] if len(parts) == 1 else "\n\n---\n\n".join(parts)
         
-        # Calculate token estimate (rough: ~4 chars per token)
-        token_estimate = len(narrative) // 4
+        token_estimate = estimate_tokens(narrative)
         
         return cls(
-            id=f"aio-{hash(source_url) % 100000:05d}",
+            id=make_envelope_id("aio", source_url),
             source_url=source_url,
             source_type="aio",
             narrative=narrative,
@@ -175,7 +369,10 @@ class ContentEnvelope:
             relevance_ratio=1.0,
             chunks=chunks,
             aio_version=aio_data.get("aio_version"),
-            integrity=IntegrityInfo(verified=True),
+            integrity=IntegrityInfo(
+                narrative_hash=hash_narrative(narrative),
+                verified=True,
+            ),
         )
     
     @classmethod
@@ -197,10 +394,10 @@ class ContentEnvelope:
             noise_score = 0.0
         
         relevance_ratio = 1.0 - noise_score
-        token_estimate = len(content) // 4
+        token_estimate = estimate_tokens(content)
         
         return cls(
-            id=f"scraped-{hash(source_url) % 100000:05d}",
+            id=make_envelope_id("scraped", source_url),
             source_url=source_url,
             source_type="scraped",
             narrative=content,
@@ -209,5 +406,8 @@ class ContentEnvelope:
             noise_score=noise_score,
             relevance_ratio=relevance_ratio,
             chunks=[],
-            integrity=IntegrityInfo(verified=False),
+            integrity=IntegrityInfo(
+                narrative_hash=hash_narrative(content),
+                verified=False,
+            ),
         )
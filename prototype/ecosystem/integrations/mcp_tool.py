@@ -14,9 +14,17 @@ Tool Definition:
 """
 
 import json
-from typing import Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
 from dataclasses import dataclass
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 @dataclass
 class MCPToolResult:
@@ -41,6 +49,40 @@ class MCPToolResult:
             }
 
 
+# Parsed envelopes are not mutated afterwards, so repeat fetches of the same
+# (url, query) within a session can share one for CACHE_TTL_SECONDS.
+# The least recently used entry is dropped beyond CACHE_MAX_ENTRIES.
+CACHE_TTL_SECONDS = 300
+CACHE_MAX_ENTRIES = 256
+
+_parse_cache: "OrderedDict[Tuple[str, Optional[str]], Tuple[float, Any]]" = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+
+def _parse(url: str, query: Optional[str] = None):
+    """Parse url, reusing a recent successful parse; failures are not cached."""
+    key = (url, query)
+    now = time.monotonic()
+    with _parse_cache_lock:
+        entry = _parse_cache.get(key)
+        if entry is not None and now < entry[0]:
+            _parse_cache.move_to_end(key)
+            return entry[1]
+    
+    # Misses fall through to the on-disk cache shared across processes
+    from aio_parser.cache import cached_parse
+    envelope = cached_parse(url, query)
+    
+    # A failed fetch comes back as an empty narrative rather than an error
+    if envelope.narrative:
+        with _parse_cache_lock:
+            _parse_cache[key] = (now + CACHE_TTL_SECONDS, envelope)
+            _parse_cache.move_to_end(key)
+            while len(_parse_cache) > CACHE_MAX_ENTRIES:
+                _parse_cache.popitem(last=False)
+    return envelope
+
+
 def aio_web_fetch(url: str, query: Optional[str] = None) -> MCPToolResult:
     """
     MCP Tool: Fetch web content using AIO-aware parser.
@@ -58,9 +100,7 @@ def aio_web_fetch(url: str, query: Optional[str] = None) -> MCPToolResult:
         MCPToolResult with clean content and metadata
     """
     try:
-        from aio_parser import parse
-        
-        envelope = parse(url, query=query)
+        envelope = _parse(url, query)
         
         # Format metadata for AI
         metadata = {
@@ -72,7 +112,8 @@ def aio_web_fetch(url: str, query: Optional[str] = None) -> MCPToolResult:
             "chunks_available": len(envelope.chunks),
         }
         
-        # Add chunk summaries if available
+        # Add chunk summaries if available (the parser has already narrowed
+        # the chunks to the query, together with the narrative)
         if envelope.chunks:
             metadata["chunk_index"] = [
                 {"id": c.id, "title": c.title, "summary": c.summary}
@@ -224,7 +265,10 @@ if __name__ == "__main__":
     print("AIO Web Fetch MCP Tool")
     print("=" * 40)
     print("\nTool Definition:")
-    print(json.dumps(MCP_TOOL_DEFINITION, indent=2))
+    if orjson is not None:
+        print(orjson.dumps(MCP_TOOL_DEFINITION, option=orjson.OPT_INDENT_2).decode())
+    else:
+        print(json.dumps(MCP_TOOL_DEFINITION, indent=2))
     
     print("\n\nExample usage:")
     print('  result = aio_web_fetch("https://example.com", query="pricing")')
@@ -18,6 +18,7 @@ Usage:
 from .parser import parse, AIOParser
 from .envelope import ContentEnvelope, ChunkIndex
 from .discovery import discover_aio
+from .cache import EnvelopeCache
 
 __version__ = "0.1.0"
-__all__ = ["parse", "AIOParser", "ContentEnvelope", "ChunkIndex", "discover_aio"]
+__all__ = ["parse", "AIOParser", "ContentEnvelope", "ChunkIndex", "discover_aio", "EnvelopeCache"]
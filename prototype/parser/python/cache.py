@@ -0,0 +1,181 @@
+"""
+Envelope Cache - Persistent cache of parsed ContentEnvelopes.
+
+Envelopes are stored in a local SQLite file keyed by a BLAKE2b digest of
+(parser version, url, query), so repeat fetches survive process restarts and
+a version bump starts from a fresh key namespace.
+
+Usage:
+    from aio_parser.cache import cached_parse
+
+    envelope = cached_parse("https://example.com/pricing", query="price")
+"""
+
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from .envelope import ContentEnvelope
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "aio_parser")
+DEFAULT_TTL = 24 * 60 * 60  # seconds
+
+
+class EnvelopeCache:
+    """
+    SQLite-backed envelope store, safe to share between threads.
+
+    Usage:
+        cache = EnvelopeCache()
+        envelope = cache.get(url, query)
+        if envelope is None:
+            envelope = parse(url, query)
+            cache.set(url, query, envelope)
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = DEFAULT_TTL):
+        """
+        Open (or create) the cache.
+
+        Args:
+            path: SQLite file; defaults to envelopes.sqlite3 in $AIO_CACHE_DIR
+                  or ~/.cache/aio_parser
+            ttl: Seconds before a stored envelope is considered stale
+        """
+        from . import __version__
+
+        if path is None:
+            cache_dir = os.environ.get("AIO_CACHE_DIR", DEFAULT_CACHE_DIR)
+            os.makedirs(cache_dir, exist_ok=True)
+            path = os.path.join(cache_dir, "envelopes.sqlite3")
+
+        self.path = path
+        self.ttl = ttl
+        self._namespace = __version__
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS envelopes (
+                key TEXT PRIMARY KEY,
+                stored_at REAL NOT NULL,
+                data BLOB NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def key(self, url: str, query: Optional[str] = None) -> str:
+        """Cache key for a (url, query) pair under the current parser version."""
+        raw = f"{self._namespace}\n{url}\n{query or ''}"
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, url: str, query: Optional[str] = None) -> Optional[ContentEnvelope]:
+        """
+        Return the stored envelope, or None if missing or stale.
+
+        A cache that cannot be read (database locked, corrupt or outdated
+        row) also returns None, so the caller falls back to parsing.
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT stored_at, data FROM envelopes WHERE key = ?",
+                    (self.key(url, query),)
+                ).fetchone()
+
+            if row is None or time.time() - row[0] > self.ttl:
+                return None
+            return ContentEnvelope.from_json(row[1])
+        except (sqlite3.Error, ValueError, KeyError, TypeError):
+            return None
+
+    def set(self, url: str, query: Optional[str], envelope: ContentEnvelope) -> None:
+        """Store an envelope, replacing any previous entry."""
+        # Streamed straight into one bytes buffer, which sqlite3 binds
+        # without a copy (no intermediate JSON str to re-encode)
+        buffer = io.BytesIO()
+        envelope.dump_to(buffer)
+        data = buffer.getbuffer()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO envelopes (key, stored_at, data) VALUES (?, ?, ?)",
+                (self.key(url, query), time.time(), data)
+            )
+            self._conn.commit()
+
+    def purge(self) -> int:
+        """Delete stale entries. Returns the number removed."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM envelopes WHERE stored_at < ?", (time.time() - self.ttl,)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        """Delete all entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM envelopes")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache: Optional[EnvelopeCache] = None
+_default_cache_unavailable = False
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[EnvelopeCache]:
+    """
+    Shared process-wide cache, opened on first use.
+
+    Returns None if the cache file cannot be opened (e.g. read-only home),
+    in which case callers should parse without caching.
+    """
+    global _default_cache, _default_cache_unavailable
+    with _default_cache_lock:
+        if _default_cache is None and not _default_cache_unavailable:
+            try:
+                _default_cache = EnvelopeCache()
+            except (OSError, sqlite3.Error):
+                # Don't retry on every call
+                _default_cache_unavailable = True
+        return _default_cache
+
+
+def cached_parse(url: str, query: Optional[str] = None, parser=None) -> ContentEnvelope:
+    """
+    Parse a URL, serving and storing the result through the default cache.
+
+    Args:
+        url: URL to parse
+        query: Optional query for targeted retrieval
+        parser: AIOParser to use on a miss (the shared default if omitted)
+    """
+    cache = get_default_cache()
+    if cache is not None:
+        envelope = cache.get(url, query)
+        if envelope is not None:
+            return envelope
+
+    if parser is None:
+        from .parser import parse
+        envelope = parse(url, query)
+    else:
+        envelope = parser.parse(url, query)
+
+    # Only successful parses are stored: a failed fetch comes back as an
+    # empty narrative and would otherwise be served for the whole TTL
+    if cache is not None and envelope.narrative:
+        try:
+            cache.set(url, query, envelope)
+        except sqlite3.Error:
+            pass  # e.g. database locked or disk full; the parse still stands
+    return envelope
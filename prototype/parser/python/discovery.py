@@ -8,11 +8,41 @@ Implements the 4-priority discovery mechanism from AIO v2.1 spec:
 4. Direct URL attempt
 """
 
+import codecs
+import html
 import re
-from typing import Optional, Tuple
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 import requests
-from bs4 import BeautifulSoup
+
+from .session import DEFAULT_USER_AGENT, create_session
+
+# Seconds a discovery or robots.txt result is reused (6 hours)
+DISCOVERY_CACHE_TTL = 6 * 60 * 60
+
+# Seconds a "no AIO" result is reused when a probe failed with a network
+# error, so a transient outage is retried soon instead of pinned for hours
+DISCOVERY_FAILURE_TTL = 60
+
+# Entries kept per cache (URLs, origins); the least recently used go first
+DISCOVERY_CACHE_SIZE = 1024
+
+# Link header: one match per link-value, <target> followed by its parameters
+_LINK_VALUE_RE = re.compile(r'<([^>]*)>([^<]*)')
+_REL_ALTERNATE_RE = re.compile(r';\s*rel\s*=\s*"?[^";,]*\balternate\b', re.I)
+_TYPE_AIO_RE = re.compile(r';\s*type\s*=\s*"?application/aio\+json\b', re.I)
+
+# Bytes of HTML read while looking for </head> before giving up
+HEAD_SCAN_LIMIT = 64 * 1024
+_HEAD_END_RE = re.compile(rb'</head\s*>', re.I)
+
+# HTML: each <link ...> tag, then its attributes (quoted or bare values)
+_LINK_TAG_RE = re.compile(r'<link\b[^>]*>', re.I)
+_ATTR_RE = re.compile(r'''([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))''')
 
 
 class AIODiscovery:
@@ -26,11 +56,59 @@ class AIODiscovery:
     4. Direct URL attempt - /ai-content.aio at site root
     """
     
-    def __init__(self, timeout: int = 10, user_agent: str = None):
+    def __init__(self, timeout: int = 10, user_agent: str = None,
+                 session: Optional[requests.Session] = None,
+                 cache_ttl: float = DISCOVERY_CACHE_TTL,
+                 failure_cache_ttl: float = DISCOVERY_FAILURE_TTL,
+                 cache_size: int = DISCOVERY_CACHE_SIZE):
         self.timeout = timeout
-        self.user_agent = user_agent or "AIOParser/0.1 (ECR-Compatible)"
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": self.user_agent})
+        self.user_agent = user_agent or DEFAULT_USER_AGENT
+        # A session passed in (e.g. by AIOParser) is shared with other components
+        self.session = session or create_session(self.user_agent)
+        
+        # Results (including "no AIO") are reused for cache_ttl seconds:
+        # full discovery per URL, robots.txt lookups per origin. A discovery
+        # where a probe failed is kept only for failure_cache_ttl seconds,
+        # and a failed robots.txt fetch is not cached at all. Each cache holds
+        # at most cache_size entries, so a long-lived parser stays bounded
+        self.cache_ttl = cache_ttl
+        self.failure_cache_ttl = failure_cache_ttl
+        self.cache_size = cache_size
+        self._discovery_cache: "OrderedDict[str, Tuple[float, Tuple[Optional[str], str]]]" = OrderedDict()
+        self._robots_cache: "OrderedDict[str, Tuple[float, Optional[str]]]" = OrderedDict()
+        # Probes run on executor threads, and robots.txt lookups go through
+        # _cached from there
+        self._cache_lock = threading.Lock()
+    
+    def clear_cache(self) -> None:
+        """Forget all cached discovery and robots.txt results."""
+        with self._cache_lock:
+            self._discovery_cache.clear()
+            self._robots_cache.clear()
+    
+    def _cached(self, cache: dict, key: str,
+                compute: Callable[[], Tuple[Any, bool]]) -> Any:
+        """
+        Return the cached value for key, or store and return compute()'s.
+        
+        compute returns (value, complete); incomplete values expire after
+        failure_cache_ttl. If compute raises, nothing is cached. Beyond
+        cache_size entries the least recently used one is evicted.
+        """
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = cache.get(key)
+            if entry is not None and now < entry[0]:
+                cache.move_to_end(key)
+                return entry[1]
+        value, complete = compute()
+        ttl = self.cache_ttl if complete else self.failure_cache_ttl
+        with self._cache_lock:
+            cache[key] = (now + ttl, value)
+            cache.move_to_end(key)
+            while len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        return value
     
     def discover(self, url: str) -> Tuple[Optional[str], str]:
         """
@@ -44,30 +122,41 @@ class AIODiscovery:
             aio_url is None if no AIO found
             discovery_method is one of: "link_header", "link_tag", "robots_txt", "direct", "none"
         """
+        return self._cached(self._discovery_cache, url, lambda: self._discover(url))
+    
+    def _discover(self, url: str) -> Tuple[Tuple[Optional[str], str], bool]:
+        """Run the probes; returns ((aio_url, method), whether every probe completed)."""
         parsed = urlparse(url)
         base_url = f"{parsed.scheme}://{parsed.netloc}"
         
-        # Priority 1: Check HTTP Link header
-        aio_url = self._check_link_header(url)
-        if aio_url:
-            return urljoin(base_url, aio_url), "link_header"
-        
-        # Priority 2: Check HTML <link> tag
-        aio_url = self._check_link_tag(url)
-        if aio_url:
-            return urljoin(base_url, aio_url), "link_tag"
-        
-        # Priority 3: Check robots.txt
-        aio_url = self._check_robots_txt(base_url)
-        if aio_url:
-            return urljoin(base_url, aio_url), "robots_txt"
-        
-        # Priority 4: Direct URL attempt
-        aio_url = self._check_direct(base_url)
-        if aio_url:
-            return aio_url, "direct"
+        # All four probes run concurrently; results are then taken in
+        # priority order, so a lower-priority hit only wins once every
+        # higher-priority probe has come back empty. A probe that fails with
+        # a network error counts as empty, but marks the result incomplete
+        probes = [
+            (self._check_link_header, url, "link_header"),    # Priority 1
+            (self._check_link_tag, url, "link_tag"),          # Priority 2
+            (self._check_robots_txt, base_url, "robots_txt"), # Priority 3
+            (self._check_direct, base_url, "direct"),         # Priority 4
+        ]
+        complete = True
+        executor = ThreadPoolExecutor(max_workers=len(probes))
+        try:
+            futures = [(executor.submit(check, target), method)
+                       for check, target, method in probes]
+            for future, method in futures:
+                try:
+                    aio_url = future.result()
+                except requests.RequestException:
+                    complete = False
+                    continue
+                if aio_url:
+                    return (urljoin(base_url, aio_url), method), True
+        finally:
+            # Don't wait on lower-priority probes once a winner is known
+            executor.shutdown(wait=False, cancel_futures=True)
         
-        return None, "none"
+        return (None, "none"), complete
     
     def _check_link_header(self, url: str) -> Optional[str]:
         """
@@ -75,21 +164,18 @@ class AIODiscovery:
         
         Expected format:
         Link: </ai-content.aio>; rel="alternate"; type="application/aio+json"
+        
+        Network errors propagate (as for every probe) so discover() can
+        tell "no AIO" apart from "could not check".
         """
-        try:
-            response = self.session.head(url, timeout=self.timeout, allow_redirects=True)
-            link_header = response.headers.get("Link", "")
-            
-            # Parse Link header for AIO content
-            # Pattern: </path>; rel="alternate"; type="application/aio+json"
-            pattern = r'<([^>]+)>;\s*rel="alternate";\s*type="application/aio\+json"'
-            match = re.search(pattern, link_header)
-            
-            if match:
-                return match.group(1)
-                
-        except requests.RequestException:
-            pass
+        response = self.session.head(url, timeout=self.timeout, allow_redirects=True)
+        link_header = response.headers.get("Link", "")
+        
+        # Parse Link header for AIO content; rel/type may come in any order
+        # Pattern: </path>; rel="alternate"; type="application/aio+json"
+        for target, params in _LINK_VALUE_RE.findall(link_header):
+            if _REL_ALTERNATE_RE.search(params) and _TYPE_AIO_RE.search(params):
+                return target
         
         return None
     
@@ -100,26 +186,16 @@ class AIODiscovery:
         Expected format:
         <link rel="alternate" type="application/aio+json" href="/ai-content.aio">
         """
+        # Stream only as far as </head> instead of downloading the page
+        response = self.session.get(url, timeout=self.timeout, stream=True)
         try:
-            response = self.session.get(url, timeout=self.timeout)
             if response.status_code != 200:
                 return None
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find link tag with AIO type
-            link = soup.find('link', {
-                'rel': 'alternate',
-                'type': 'application/aio+json'
-            })
-            
-            if link and link.get('href'):
-                return link['href']
-                
-        except requests.RequestException:
-            pass
+            head = _read_head(response)
+        finally:
+            response.close()
         
-        return None
+        return find_aio_link(head.decode(_charset(response), errors='replace'))
     
     def _check_robots_txt(self, base_url: str) -> Optional[str]:
         """
@@ -128,54 +204,86 @@ class AIODiscovery:
         Expected format:
         AIO-Content: /ai-content.aio
         """
-        try:
-            robots_url = urljoin(base_url, "/robots.txt")
-            response = self.session.get(robots_url, timeout=self.timeout)
-            
-            if response.status_code != 200:
-                return None
-            
-            # Parse robots.txt for AIO-Content directive
-            for line in response.text.split('\n'):
-                line = line.strip()
-                if line.lower().startswith('aio-content:'):
-                    path = line.split(':', 1)[1].strip()
-                    return path
-                    
-        except requests.RequestException:
-            pass
+        return self._cached(self._robots_cache, base_url,
+                            lambda: (self._fetch_robots_directive(base_url), True))
+    
+    def _fetch_robots_directive(self, base_url: str) -> Optional[str]:
+        robots_url = urljoin(base_url, "/robots.txt")
+        response = self.session.get(robots_url, timeout=self.timeout)
+        
+        if response.status_code != 200:
+            return None
+        
+        # Parse robots.txt for AIO-Content directive
+        for line in response.text.split('\n'):
+            line = line.strip()
+            if line.lower().startswith('aio-content:'):
+                path = line.split(':', 1)[1].strip()
+                return path
         
         return None
     
     def _check_direct(self, base_url: str) -> Optional[str]:
         """
-        Try fetching /ai-content.aio directly.
+        Try /ai-content.aio directly (HEAD only).
+        
+        A 200 with a JSON content type is accepted without downloading the
+        body; AIOFetcher.fetch validates the structure when it fetches it.
         """
-        try:
-            aio_url = urljoin(base_url, "/ai-content.aio")
-            response = self.session.head(aio_url, timeout=self.timeout)
-            
-            if response.status_code == 200:
-                # Verify it's actually AIO content
-                content_type = response.headers.get("Content-Type", "")
-                if "aio+json" in content_type or "application/json" in content_type:
-                    return aio_url
-                    
-                # If no content-type, try GET to verify structure
-                response = self.session.get(aio_url, timeout=self.timeout)
-                try:
-                    data = response.json()
-                    if "aio_version" in data:
-                        return aio_url
-                except:
-                    pass
-                    
-        except requests.RequestException:
-            pass
+        aio_url = urljoin(base_url, "/ai-content.aio")
+        response = self.session.head(aio_url, timeout=self.timeout)
+        
+        if response.status_code == 200:
+            # Verify it's actually AIO content
+            content_type = response.headers.get("Content-Type", "")
+            if "aio+json" in content_type or "application/json" in content_type:
+                return aio_url
         
         return None
 
 
+def _read_head(response: requests.Response, chunk_size: int = 8192) -> bytes:
+    """Read a streamed response up to the end of <head> (or HEAD_SCAN_LIMIT bytes)."""
+    buf = bytearray()
+    for chunk in response.iter_content(chunk_size):
+        # Rescan a few bytes before the new chunk in case </head> straddles it
+        start = max(0, len(buf) - 8)
+        buf += chunk
+        if _HEAD_END_RE.search(buf, start) or len(buf) >= HEAD_SCAN_LIMIT:
+            break
+    return bytes(buf[:HEAD_SCAN_LIMIT])
+
+
+def _charset(response: requests.Response) -> str:
+    """The response's declared charset, or utf-8 if it is missing or unknown to Python."""
+    encoding = response.encoding
+    if encoding:
+        try:
+            codecs.lookup(encoding)
+            return encoding
+        except LookupError:
+            pass
+    return 'utf-8'
+
+
+def find_aio_link(markup: str) -> Optional[str]:
+    """
+    Return the href of the first AIO <link> tag in an HTML document, if any.
+    
+    A regex scan over the raw markup: matches <link> tags whose rel includes
+    "alternate" and whose type is "application/aio+json", in any attribute order.
+    """
+    for tag in _LINK_TAG_RE.finditer(markup):
+        attrs = {}
+        for name, dq, sq, bare in _ATTR_RE.findall(tag.group()):
+            attrs.setdefault(name.lower(), dq or sq or bare)
+        if (attrs.get('type') == 'application/aio+json'
+                and 'alternate' in attrs.get('rel', '').lower().split()
+                and attrs.get('href')):
+            return html.unescape(attrs['href'])
+    return None
+
+
 def discover_aio(url: str, timeout: int = 10) -> Tuple[Optional[str], str]:
     """
     Convenience function for AIO discovery.
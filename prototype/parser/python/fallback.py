@@ -9,9 +9,27 @@ When a site doesn't have AIO content, this module:
 """
 
 import re
-from typing import Tuple, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 import requests
-from bs4 import BeautifulSoup, Comment
+import soupsieve
+from bs4 import BeautifulSoup, Comment, SoupStrainer, Tag
+
+from .session import DEFAULT_USER_AGENT, create_session
+
+# Prefer the libxml2-backed parser; fall back to the pure-Python one
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# _clean_whitespace patterns; [^\S\n] is any whitespace except newline
+_MULTI_BLANK_RE = re.compile(r'\n{3,}')
+_LINE_EDGE_WS_RE = re.compile(r'^[^\S\n]+|[^\S\n]+$', re.MULTILINE)
+
+# Only <body> is ever read, so <head> (scripts, styles, meta) is never built.
+# lxml always synthesizes a <body>; html.parser does not, so it parses fully.
+_BODY_ONLY = SoupStrainer('body') if HTML_PARSER == 'lxml' else None
 
 
 class HTMLScraper:
@@ -21,31 +39,51 @@ class HTMLScraper:
     """
     
     # Tags to remove completely (navigation, ads, etc.)
-    NOISE_TAGS = [
+    NOISE_TAGS = frozenset({
         'nav', 'header', 'footer', 'aside', 'script', 'style', 'noscript',
         'iframe', 'form', 'button', 'input', 'select', 'textarea',
         'svg', 'canvas', 'video', 'audio', 'map', 'object', 'embed'
-    ]
+    })
     
-    # Class names that typically indicate noise
-    NOISE_CLASSES = [
+    # Class names that typically indicate noise (lowercased once, here)
+    NOISE_CLASSES = tuple(s.lower() for s in (
         'nav', 'navigation', 'menu', 'sidebar', 'footer', 'header',
         'cookie', 'banner', 'ad', 'advertisement', 'promo', 'popup',
         'modal', 'overlay', 'social', 'share', 'comment', 'related',
         'widget', 'newsletter', 'subscribe'
-    ]
+    ))
     
     # ID patterns that indicate noise
-    NOISE_IDS = [
+    NOISE_IDS = tuple(s.lower() for s in (
         'nav', 'menu', 'sidebar', 'footer', 'header', 'cookie',
         'banner', 'ad', 'popup', 'modal', 'overlay'
-    ]
+    ))
     
-    def __init__(self, timeout: int = 10, user_agent: str = None):
+    # Every noise rule as one CSS selector list, matched in a single pass.
+    # [attr*=x i] is a case-insensitive substring match on class/id
+    NOISE_SELECTOR = ','.join([
+        *sorted(NOISE_TAGS),
+        *(f'[class*="{c}" i]' for c in NOISE_CLASSES),
+        *(f'[id*="{i}" i]' for i in NOISE_IDS),
+    ])
+    # Parsed once here rather than on every select() call
+    _NOISE_MATCHER = soupsieve.compile(NOISE_SELECTOR)
+    
+    # Priority order for main content detection (see _find_main_content)
+    _MAIN_SELECTORS = (
+        ('main', {}),
+        ('article', {}),
+        ('div', {'role': 'main'}),
+        ('div', {'id': re.compile(r'main|content|article', re.I)}),
+        ('div', {'class': re.compile(r'main|content|article|post', re.I)}),
+    )
+    
+    def __init__(self, timeout: int = 10, user_agent: str = None,
+                 session: Optional[requests.Session] = None):
         self.timeout = timeout
-        self.user_agent = user_agent or "AIOParser/0.1 (ECR-Compatible)"
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": self.user_agent})
+        self.user_agent = user_agent or DEFAULT_USER_AGENT
+        # A session passed in (e.g. by AIOParser) is shared with other components
+        self.session = session or create_session(self.user_agent)
     
     def scrape(self, url: str) -> Tuple[str, int, int]:
         """
@@ -78,25 +116,18 @@ class HTMLScraper:
         """
         Remove noise and extract main content.
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, HTML_PARSER, parse_only=_BODY_ONLY)
         
         # Remove comments
         for comment in soup.find_all(string=lambda t: isinstance(t, Comment)):
             comment.extract()
         
-        # Remove noise tags
-        for tag in self.NOISE_TAGS:
-            for element in soup.find_all(tag):
+        # Remove noise tags, classes and IDs in one traversal; a match nested
+        # inside an earlier match was already destroyed with its ancestor
+        for element in self._NOISE_MATCHER.select(soup):
+            if not element.decomposed:
                 element.decompose()
         
-        # Remove elements with noise classes
-        for element in soup.find_all(class_=self._is_noise_class):
-            element.decompose()
-        
-        # Remove elements with noise IDs
-        for element in soup.find_all(id=self._is_noise_id):
-            element.decompose()
-        
         # Try to find main content area
         main_content = self._find_main_content(soup)
         
@@ -112,81 +143,53 @@ class HTMLScraper:
         
         return text
     
-    def _is_noise_class(self, class_list):
-        """Check if any class indicates noise."""
-        if not class_list:
-            return False
-        if isinstance(class_list, str):
-            class_list = [class_list]
-        for cls in class_list:
-            cls_lower = cls.lower()
-            for noise in self.NOISE_CLASSES:
-                if noise in cls_lower:
-                    return True
-        return False
-    
-    def _is_noise_id(self, id_value):
-        """Check if ID indicates noise."""
-        if not id_value:
-            return False
-        id_lower = id_value.lower()
-        for noise in self.NOISE_IDS:
-            if noise in id_lower:
-                return True
-        return False
-    
-    def _find_main_content(self, soup: BeautifulSoup) -> Optional[BeautifulSoup]:
+    def _find_main_content(self, soup: BeautifulSoup) -> Optional[Tag]:
         """
         Try to identify the main content area.
         """
-        # Priority order for main content detection
-        selectors = [
-            ('main', {}),
-            ('article', {}),
-            ('div', {'role': 'main'}),
-            ('div', {'id': re.compile(r'main|content|article', re.I)}),
-            ('div', {'class': re.compile(r'main|content|article|post', re.I)}),
-        ]
-        
-        for tag, attrs in selectors:
+        for tag, attrs in self._MAIN_SELECTORS:
             element = soup.find(tag, attrs)
             if element:
                 return element
         
         return None
     
-    def _extract_text(self, element: BeautifulSoup) -> str:
+    def _extract_text(self, element: Optional[Tag]) -> str:
         """
         Extract text with basic formatting preserved.
         """
         if not element:
             return ""
         
-        lines = []
+        lines: List[str] = []
         
-        for child in element.descendants:
-            if child.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                level = int(child.name[1])
-                prefix = '#' * level
-                lines.append(f"\n{prefix} {child.get_text(strip=True)}\n")
-            elif child.name == 'p':
-                text = child.get_text(strip=True)
-                if text:
-                    lines.append(f"\n{text}\n")
-            elif child.name == 'li':
-                text = child.get_text(strip=True)
-                if text:
-                    lines.append(f"- {text}")
-            elif child.name == 'br':
-                lines.append("\n")
-            elif child.name == 'table':
-                lines.append(self._extract_table(child))
+        # Only tags with a handler produce output, so let find_all skip text
+        # nodes and other tags instead of testing every descendant here
+        for child in element.find_all(self._TEXT_TAGS):
+            line = self._TEXT_HANDLERS[child.name](self, child)
+            if line is not None:
+                lines.append(line)
         
         return '\n'.join(lines)
     
-    def _extract_table(self, table: BeautifulSoup) -> str:
+    def _format_heading(self, tag: Tag) -> str:
+        prefix = '#' * int(tag.name[1])
+        return f"\n{prefix} {tag.get_text(strip=True)}\n"
+    
+    def _format_paragraph(self, tag: Tag) -> Optional[str]:
+        text = tag.get_text(strip=True)
+        return f"\n{text}\n" if text else None
+    
+    def _format_list_item(self, tag: Tag) -> Optional[str]:
+        text = tag.get_text(strip=True)
+        return f"- {text}" if text else None
+    
+    def _format_break(self, tag: Tag) -> str:
+        return "\n"
+    
+    def _extract_table(self, table: Tag) -> str:
         """Extract table as markdown."""
-        rows = []
+        rows: List[str] = []
         for tr in table.find_all('tr'):
             cells = []
             for td in tr.find_all(['td', 'th']):
@@ -206,15 +209,21 @@ class HTMLScraper:
     def _clean_whitespace(self, text: str) -> str:
         """Normalize whitespace."""
         # Remove multiple blank lines
-        text = re.sub(r'\n{3,}', '\n\n', text)
+        text = _MULTI_BLANK_RE.sub('\n\n', text)
         # Remove leading/trailing whitespace per line
-        lines = [line.strip() for line in text.split('\n')]
+        text = _LINE_EDGE_WS_RE.sub('', text)
         # Remove empty lines at start/end
-        while lines and not lines[0]:
-            lines.pop(0)
-        while lines and not lines[-1]:
-            lines.pop()
-        return '\n'.join(lines)
+        return text.strip('\n')
+    
+    # Tag name -> formatter used by _extract_text
+    _TEXT_HANDLERS: Dict[str, Callable[['HTMLScraper', Tag], Optional[str]]] = {
+        **dict.fromkeys(('h1', 'h2', 'h3', 'h4', 'h5', 'h6'), _format_heading),
+        'p': _format_paragraph,
+        'li': _format_list_item,
+        'br': _format_break,
+        'table': _extract_table,
+    }
+    _TEXT_TAGS = frozenset(_TEXT_HANDLERS)
 
 
 def scrape_html(url: str, timeout: int = 10) -> Tuple[str, int, int]:
@@ -8,23 +8,50 @@ Handles:
 - Caching (future)
 """
 
+import codecs
 import hashlib
+import hmac
 import json
-from typing import Optional, Dict, List, Any
+from bisect import bisect_right
+from typing import Optional, Dict, List, Any, Set, Tuple
 from urllib.parse import urljoin
 import requests
 
+from .session import DEFAULT_USER_AGENT, create_session
+
+# Optional: orjson parses large AIO payloads several times faster
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+def _load_json(response: requests.Response) -> Any:
+    """Decode a JSON body from raw bytes (AIO files are UTF-8)."""
+    content = response.content
+    if content.startswith(codecs.BOM_UTF8):
+        content = content[len(codecs.BOM_UTF8):]
+    return _json_loads(content)
+
+# (chunk ids, keyword -> entry positions, title/summary corpus, entry offsets)
+_MatchIndex = Tuple[List[str], Dict[str, List[int]], str, List[int]]
+
 
 class AIOFetcher:
     """
     Fetches and validates AIO content files.
     """
     
-    def __init__(self, timeout: int = 10, user_agent: str = None):
+    def __init__(self, timeout: int = 10, user_agent: str = None,
+                 session: Optional[requests.Session] = None):
         self.timeout = timeout
-        self.user_agent = user_agent or "AIOParser/0.1 (ECR-Compatible)"
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": self.user_agent})
+        self.user_agent = user_agent or DEFAULT_USER_AGENT
+        # A session passed in (e.g. by AIOParser) is shared with other components
+        self.session = session or create_session(self.user_agent)
+        
+        # (aio_data, search index) for the last document matched against
+        self._index_cache: Optional[Tuple[Dict, _MatchIndex]] = None
     
     def fetch(self, aio_url: str) -> Optional[Dict]:
         """
@@ -42,7 +69,7 @@ class AIOFetcher:
             if response.status_code != 200:
                 return None
             
-            data = response.json()
+            data = _load_json(response)
             
             # Validate it's actually AIO content
             if "aio_version" not in data:
@@ -50,7 +77,8 @@ class AIOFetcher:
             
             return data
             
-        except (requests.RequestException, json.JSONDecodeError):
+        except (requests.RequestException, ValueError):
+            # ValueError covers both json and orjson decode errors
             return None
     
     def fetch_manifest(self, manifest_url: str) -> Optional[Dict]:
@@ -60,7 +88,7 @@ class AIOFetcher:
         try:
             response = self.session.get(manifest_url, timeout=self.timeout)
             if response.status_code == 200:
-                return response.json()
+                return _load_json(response)
         except:
             pass
         return None
@@ -90,12 +118,14 @@ class AIOFetcher:
         
         # Calculate hash
         if algorithm.lower() == "sha256":
-            calculated = hashlib.sha256(content.encode()).hexdigest()
+            calculated = hashlib.sha256(content.encode("utf-8")).hexdigest()
         else:
             return False  # Unsupported algorithm
         
-        # Compare (case-insensitive, partial match for truncated hashes)
-        return hash_value.lower() in calculated.lower() or calculated.lower().startswith(hash_value.lower())
+        # Constant-time compare, case-insensitive; a truncated hash must be a
+        # prefix of the full digest
+        expected = hash_value.lower().encode("utf-8")
+        return hmac.compare_digest(calculated[:len(expected)].encode("ascii"), expected)
     
     def get_matching_chunks(self, aio_data: Dict, keywords: List[str]) -> List[Dict]:
         """
@@ -108,30 +138,59 @@ class AIOFetcher:
         Returns:
             List of matching content chunks
         """
-        keywords_lower = [k.lower() for k in keywords]
-        matching_ids = []
+        ids, keyword_map, corpus, starts = self._match_index(aio_data)
+        matched: Set[int] = set()
         
-        # Search index for keyword matches
-        for idx in aio_data.get("index", []):
-            chunk_keywords = [k.lower() for k in idx.get("keywords", [])]
-            title_lower = idx.get("title", "").lower()
-            summary_lower = idx.get("summary", "").lower()
+        for kw in (k.lower() for k in keywords):
+            # Exact keyword hits
+            matched.update(keyword_map.get(kw, ()))
             
-            # Check for any keyword match
-            for kw in keywords_lower:
-                if (kw in chunk_keywords or 
-                    kw in title_lower or 
-                    kw in summary_lower):
-                    matching_ids.append(idx["id"])
-                    break
+            # Substring hits in titles/summaries: one C-level find() per
+            # matching entry, jumping to the next entry after each hit
+            if not kw:
+                matched.update(range(len(ids)))
+                continue
+            pos = corpus.find(kw)
+            while pos != -1:
+                entry = bisect_right(starts, pos) - 1
+                matched.add(entry)
+                pos = corpus.find(kw, starts[entry + 1]) if entry + 1 < len(starts) else -1
+        
+        matching_ids = {ids[entry] for entry in matched}
         
         # Get matching content
-        matching_chunks = []
-        for content in aio_data.get("content", []):
-            if content["id"] in matching_ids:
-                matching_chunks.append(content)
+        return [c for c in aio_data.get("content", []) if c["id"] in matching_ids]
+    
+    def _match_index(self, aio_data: Dict) -> _MatchIndex:
+        """
+        Search structures for an AIO document's index, built once per document.
+        
+        Returns (ids, keyword -> entry positions, lowercased corpus of every
+        entry's title and summary, NUL-separated, start offset of each entry).
+        Cached by identity of aio_data, which is not expected to change after
+        fetch.
+        """
+        cached = self._index_cache
+        if cached is not None and cached[0] is aio_data:
+            return cached[1]
+        
+        ids: List[str] = []
+        keyword_map: Dict[str, List[int]] = {}
+        texts: List[str] = []
+        starts: List[int] = []
+        offset = 0
+        for position, idx in enumerate(aio_data.get("index", [])):
+            ids.append(idx["id"])
+            for keyword in idx.get("keywords", []):
+                keyword_map.setdefault(keyword.lower(), []).append(position)
+            text = f'{idx.get("title", "").lower()}\0{idx.get("summary", "").lower()}'
+            texts.append(text)
+            starts.append(offset)
+            offset += len(text) + 1
         
-        return matching_chunks
+        index = (ids, keyword_map, '\0'.join(texts), starts)
+        self._index_cache = (aio_data, index)
+        return index
     
     def get_chunk_by_id(self, aio_data: Dict, chunk_id: str) -> Optional[Dict]:
         """
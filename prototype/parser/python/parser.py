@@ -8,13 +8,34 @@ This is the primary interface for the library. It:
 4. Returns a unified ContentEnvelope
 """
 
-from typing import Optional, List
+from sys import intern
+from typing import Dict, Optional, List
 from urllib.parse import urlparse
 
 from .discovery import AIODiscovery, discover_aio
 from .fetcher import AIOFetcher
 from .fallback import HTMLScraper
-from .envelope import ContentEnvelope, ChunkIndex
+from .envelope import ContentEnvelope, ChunkIndex, estimate_tokens, make_envelope_id
+from .session import DEFAULT_USER_AGENT, create_session
+
+
+# Common stop words dropped from queries before chunk matching
+STOP_WORDS = frozenset({
+    'a', 'an', 'the', 'is', 'are', 'was', 'were', 'be', 'been',
+    'what', 'how', 'when', 'where', 'who', 'which', 'why',
+    'do', 'does', 'did', 'can', 'could', 'would', 'should',
+    'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her',
+    'of', 'in', 'on', 'at', 'to', 'for', 'with', 'by', 'from',
+    'and', 'or', 'but', 'if', 'then', 'so', 'as'
+})
+
+# Trailing/leading punctuation trimmed from query words
+_QUERY_PUNCT = '?.,!'
+
+
+def join_narrative(content_items: List[dict]) -> str:
+    """Combine AIO content items into one narrative, separated by rules."""
+    return "\n\n---\n\n".join([c.get("content", "") for c in content_items])
 
 
 class AIOParser:
@@ -36,12 +57,19 @@ class AIOParser:
             user_agent: Custom user agent string
         """
         self.timeout = timeout
-        self.user_agent = user_agent or "AIOParser/0.1 (ECR-Compatible)"
+        self.user_agent = user_agent or DEFAULT_USER_AGENT
+        
+        # One pooled session for all components, so discovery, AIO fetch and
+        # scraping of the same host reuse its connection
+        self.session = create_session(self.user_agent)
         
         # Initialize components
-        self.discovery = AIODiscovery(timeout=timeout, user_agent=user_agent)
-        self.fetcher = AIOFetcher(timeout=timeout, user_agent=user_agent)
-        self.scraper = HTMLScraper(timeout=timeout, user_agent=user_agent)
+        self.discovery = AIODiscovery(timeout=timeout, user_agent=self.user_agent,
+                                      session=self.session)
+        self.fetcher = AIOFetcher(timeout=timeout, user_agent=self.user_agent,
+                                  session=self.session)
+        self.scraper = HTMLScraper(timeout=timeout, user_agent=self.user_agent,
+                                   session=self.session)
     
     def parse(self, url: str, query: Optional[str] = None) -> ContentEnvelope:
         """
@@ -76,63 +104,52 @@ class AIOParser:
             # AIO fetch failed, fallback to HTML
             return self._parse_html(original_url)
         
-        # Build chunk index for all chunks
-        all_chunks = []
-        for idx in aio_data.get("index", []):
-            all_chunks.append(ChunkIndex(
-                id=idx["id"],
-                path=idx.get("path", ""),
-                title=idx.get("title", ""),
-                keywords=idx.get("keywords", []),
-                summary=idx.get("summary", ""),
-                content_type=idx.get("content_type", "article"),
-                token_estimate=idx.get("token_estimate", 0),
-                priority=idx.get("priority", 0.5),
-                related=idx.get("related", []),
-            ))
+        index_entries = aio_data.get("index", [])
+        content_items = aio_data.get("content", [])
         
-        # If query provided, find matching chunks
+        # If query provided, narrow to matching chunks (no matches: keep all)
         if query:
             keywords = self._extract_keywords(query)
             matching_chunks = self.fetcher.get_matching_chunks(aio_data, keywords)
             
             if matching_chunks:
-                # Combine matching chunk content ONLY
-                narrative = "\n\n---\n\n".join(
-                    chunk.get("content", "") for chunk in matching_chunks
-                )
-                
                 # Verify chunk hashes
                 for chunk in matching_chunks:
                     self.fetcher.verify_chunk_hash(chunk)
                 
-                # Filter chunks to only matched ones
-                matched_ids = [c["id"] for c in matching_chunks]
-                chunks = [c for c in all_chunks if c.id in matched_ids]
-                token_estimate = sum(c.token_estimate for c in chunks)
-            else:
-                # No matches, return all content
-                narrative = "\n\n---\n\n".join(
-                    c.get("content", "") for c in aio_data.get("content", [])
-                )
-                chunks = all_chunks
-                token_estimate = sum(c.token_estimate for c in chunks)
-        else:
-            # No query, return all content
-            narrative = "\n\n---\n\n".join(
-                c.get("content", "") for c in aio_data.get("content", [])
+                # Combine matching chunk content ONLY, and filter the index to it
+                content_items = matching_chunks
+                matched_ids = {c["id"] for c in matching_chunks}
+                index_entries = [idx for idx in index_entries if idx["id"] in matched_ids]
+        
+        # Build ChunkIndex objects only for the entries that are returned
+        # (keywords/content types interned: a small shared vocabulary)
+        chunks = [
+            ChunkIndex(
+                id=idx["id"],
+                path=idx.get("path", ""),
+                title=idx.get("title", ""),
+                keywords=[intern(k) for k in idx.get("keywords", ())],
+                summary=idx.get("summary", ""),
+                content_type=intern(idx.get("content_type", "article")),
+                token_estimate=idx.get("token_estimate", 0),
+                priority=idx.get("priority", 0.5),
+                related=idx.get("related", []),
             )
-            chunks = all_chunks
-            token_estimate = sum(c.token_estimate for c in chunks)
+            for idx in index_entries
+        ]
+        
+        narrative = join_narrative(content_items)
+        token_estimate = sum(c.token_estimate for c in chunks)
         
         # Build envelope with correct narrative and token count
         return ContentEnvelope(
-            id=f"aio-{hash(original_url) % 100000:05d}",
+            id=make_envelope_id("aio", original_url),
             source_url=original_url,
             source_type="aio",
             narrative=narrative,
             format="markdown",
-            tokens=token_estimate if token_estimate > 0 else len(narrative) // 4,
+            tokens=token_estimate if token_estimate > 0 else estimate_tokens(narrative),
             noise_score=0.0,
             relevance_ratio=1.0,
             chunks=chunks,
@@ -151,21 +168,9 @@ class AIOParser:
         Extract keywords from a query string.
         Simple implementation - can be enhanced with NLP.
         """
-        # Remove common stop words
-        stop_words = {
-            'a', 'an', 'the', 'is', 'are', 'was', 'were', 'be', 'been',
-            'what', 'how', 'when', 'where', 'who', 'which', 'why',
-            'do', 'does', 'did', 'can', 'could', 'would', 'should',
-            'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her',
-            'of', 'in', 'on', 'at', 'to', 'for', 'with', 'by', 'from',
-            'and', 'or', 'but', 'if', 'then', 'so', 'as'
-        }
-        
-        # Tokenize and filter
-        words = query.lower().split()
-        keywords = [w.strip('?.,!') for w in words if w.strip('?.,!') not in stop_words]
-        
-        return keywords
+        # Tokenize, trim punctuation once per word and drop stop words
+        stripped = (w.strip(_QUERY_PUNCT) for w in query.lower().split())
+        return [w for w in stripped if w and w not in STOP_WORDS]
     
     def check_aio_support(self, url: str) -> dict:
         """
@@ -182,6 +187,9 @@ class AIOParser:
         }
 
 
+_shared_parsers: Dict[int, AIOParser] = {}
+
+
 def parse(url: str, query: Optional[str] = None, timeout: int = 10) -> ContentEnvelope:
     """
     Convenience function for parsing a URL.
@@ -200,5 +208,8 @@ def parse(url: str, query: Optional[str] = None, timeout: int = 10) -> ContentEn
         >>> print(envelope.narrative)
         >>> print(f"Tokens: {envelope.tokens}, Noise: {envelope.noise_score}")
     """
-    parser = AIOParser(timeout=timeout)
+    # Reuse one parser per timeout so its session and discovery cache persist
+    parser = _shared_parsers.get(timeout)
+    if parser is None:
+        parser = _shared_parsers.setdefault(timeout, AIOParser(timeout=timeout))
     return parser.parse(url, query)
@@ -0,0 +1,43 @@
+"""
+HTTP Session - Shared, pooled requests session for all parser components.
+
+Discovery, AIO fetching and HTML scraping usually hit the same host in
+sequence; routing them through one Session lets them reuse the open
+TCP/TLS connection instead of handshaking per component.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_USER_AGENT = "AIOParser/0.1 (ECR-Compatible)"
+
+
+def create_session(user_agent: str = None, pool_size: int = 32, retries: int = 2) -> requests.Session:
+    """
+    Build a requests Session with connection pooling and light retries.
+
+    Args:
+        user_agent: User-Agent header (defaults to the parser's UA)
+        pool_size: Max pooled hosts and connections per host
+        retries: Retries for connection errors and 502/503/504 responses
+
+    Returns:
+        Configured requests.Session
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"HEAD", "GET"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    # requests' default Accept-Encoding already offers br when brotli is
+    # installed (the "fast" extra); AIO JSON compresses notably better with it
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": user_agent or DEFAULT_USER_AGENT})
+    return session
@@ -13,30 +13,58 @@ Endpoints:
 - GET  /api/v1/entities - Query entities
 - GET  /api/v1/stats - Storage statistics
 - GET  /health - Health check
+
+Production: run under gunicorn (threaded workers, keep-alive), configured
+in rag-prototype/gunicorn.conf.py:
+    gunicorn aio_api.server:app
+`python server.py` starts Flask's development server.
 """
 
+import hashlib
+import json
 import os
 import sys
+from concurrent.futures import as_completed
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from flask import Flask, request, jsonify
-from aio_core.pipeline import AIOPipeline
-from aio_api.storage import EnvelopeStorage
+from aio_api.storage import EnvelopeStorage, content_fingerprint
+from aio_api import workers
+
+# Optional: orjson builds response bodies several times faster than jsonify
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 app = Flask(__name__)
 
-# Initialize components
-pipeline = AIOPipeline()
+
+def ojsonify(obj):
+    """jsonify() counterpart that serializes with orjson when it is installed."""
+    if orjson is None:
+        return jsonify(obj)
+    return app.response_class(orjson.dumps(obj), mimetype='application/json')
+
+
+def _json_line(obj) -> bytes:
+    """One NDJSON line."""
+    if orjson is None:
+        return json.dumps(obj).encode('utf-8') + b'\n'
+    return orjson.dumps(obj) + b'\n'
+
+
+# Initialize components (the pipeline itself runs in aio_api.workers)
 storage = EnvelopeStorage(os.environ.get('ECR_DB_PATH', 'envelopes.db'))
 
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
-    return jsonify({
+    return ojsonify({
         "status": "healthy",
         "version": "0.1.0",
         "storage": storage.get_stats()
@@ -67,11 +95,15 @@ def process_content():
         "entities": [...],
         "integrity": {...}
     }
+    
+    Content already processed from the same source (e.g. a retried
+    request) is answered from storage without re-running the pipeline;
+    such responses carry "deduplicated": true.
     """
     data = request.get_json()
     
     if not data or 'content' not in data:
-        return jsonify({"error": "Missing 'content' field"}), 400
+        return ojsonify({"error": "Missing 'content' field"}), 400
     
     content = data['content']
     source = data.get('source', 'unknown')
@@ -79,59 +111,69 @@ def process_content():
     should_store = data.get('store', True)
     
     try:
-        # Process through pipeline
-        if content_type == 'html':
-            result = pipeline.process_with_report(content, source, 'web')
-        else:
-            envelope = pipeline.process_markdown(content, source, 'markdown')
-            result = {"envelope": envelope, "report": {
-                "noise_stripping": {
-                    "noise_score": envelope.narrative.noise_score,
-                    "final_tokens": envelope.narrative.token_count
-                }
-            }}
+        # Same input already processed: answer from storage
+        content_hash = content_fingerprint(content, source, content_type)
+        existing = storage.get_envelope_by_content_hash(content_hash)
+        if existing is not None:
+            response = _process_response(existing, stored=True)
+            response["deduplicated"] = True
+            return ojsonify(response)
+        
+        # Process through pipeline (in a worker process, off the GIL)
+        result = workers.submit(content, source, content_type).result()
         
         envelope = result['envelope']
         report = result.get('report', {})
         
+        # Serialized once, for both storage and the response
+        envelope_dict = envelope.to_dict()
+        
         # Store if requested
         if should_store:
-            storage.store_envelope(envelope)
-        
-        # Build response
-        noise_score = envelope.narrative.noise_score
+            storage.store_envelope(envelope, content_hash, envelope_dict)
         
-        return jsonify({
-            "envelope_id": envelope.id,
-            "clean_content": envelope.narrative.content,
-            "token_count": envelope.narrative.token_count,
-            "noise_score": noise_score,
-            "noise_removed": f"{noise_score:.0%}",
-            "anchors": {
-                aid: {
-                    "type": a.type,
-                    "title": a.title,
-                    "lines": f"{a.line_start}-{a.line_end}"
-                }
-                for aid, a in envelope.anchors.items()
-            },
-            "entities": [
-                {
-                    "type": e.type,
-                    "properties": e.properties,
-                    "anchor_ref": e.anchor_ref
-                }
-                for e in envelope.entities
-            ],
-            "integrity": {
-                "narrative_hash": envelope.integrity.narrative_hash,
-                "generated_at": envelope.integrity.generated_at
-            },
-            "stored": should_store
-        })
+        return ojsonify(_process_response(envelope_dict, should_store))
         
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}), 500
+
+
+def _process_response(envelope_dict: dict, stored: bool) -> dict:
+    """Build the /process response from a serialized envelope."""
+    narrative = envelope_dict["narrative"]
+    noise_score = narrative["noise_score"]
+    
+    return {
+        "envelope_id": envelope_dict["id"],
+        "clean_content": narrative["content"],
+        "token_count": narrative["token_count"],
+        "noise_score": noise_score,
+        "noise_removed": f"{noise_score:.0%}",
+        "anchors": {
+            aid: {
+                "type": a["type"],
+                "title": a["title"],
+                "lines": f"{a['line_start']}-{a['line_end']}"
+            }
+            for aid, a in envelope_dict["anchors"].items()
+        },
+        "entities": [
+            {
+                "type": e["@type"],
+                "properties": {
+                    k: v for k, v in e.items()
+                    if k not in ("@type", "anchor_ref", "binding_confidence")
+                },
+                "anchor_ref": e["anchor_ref"]
+            }
+            for e in envelope_dict["structure"]["entities"]
+        ],
+        "integrity": {
+            "narrative_hash": envelope_dict["integrity"]["narrative_hash"],
+            "generated_at": envelope_dict["integrity"]["generated_at"]
+        },
+        "stored": stored
+    }
 
 
 @app.route('/api/v1/envelope/<envelope_id>', methods=['GET'])
@@ -140,13 +182,20 @@ def get_envelope(envelope_id: str):
     Get a stored envelope by ID.
     
     Response: Full envelope JSON
+    
+    Sends an ETag; a request whose If-None-Match still matches gets an
+    empty 304 Not Modified without the envelope being loaded.
     """
-    envelope = storage.get_envelope(envelope_id)
+    etag = storage.get_envelope_etag(envelope_id)
+    if etag is not None and request.if_none_match.contains_weak(etag):
+        return _not_modified(etag)
+    
+    envelope = storage.get_envelope(envelope_id) if etag is not None else None
     
     if not envelope:
-        return jsonify({"error": f"Envelope '{envelope_id}' not found"}), 404
+        return ojsonify({"error": f"Envelope '{envelope_id}' not found"}), 404
     
-    return jsonify(envelope)
+    return _with_etag(ojsonify(envelope), etag)
 
 
 @app.route('/api/v1/anchor/<envelope_id>/<anchor_id>', methods=['GET'])
@@ -165,23 +214,45 @@ def get_anchor(envelope_id: str, anchor_id: str):
         "content": "## Enterprise Plan...",
         "entities": [...]
     }
+    
+    Conditional requests are supported as for /api/v1/envelope/<id>.
     """
+    envelope_etag = storage.get_envelope_etag(envelope_id)
+    if envelope_etag is None:
+        return ojsonify({"error": f"Envelope '{envelope_id}' not found"}), 404
+    
+    etag = hashlib.blake2b(f"{envelope_etag}\0{anchor_id}".encode('utf-8'),
+                           digest_size=16).hexdigest()
+    if request.if_none_match.contains_weak(etag):
+        return _not_modified(etag)
+    
     content = storage.get_anchor_content(envelope_id, anchor_id)
     
     if not content:
-        return jsonify({
+        return ojsonify({
             "error": f"Anchor '{anchor_id}' not found in envelope '{envelope_id}'"
         }), 404
     
     # Also get entities linked to this anchor
     entities = storage.get_entities_by_anchor(envelope_id, anchor_id)
     
-    return jsonify({
+    return _with_etag(ojsonify({
         "envelope_id": envelope_id,
         "anchor_id": anchor_id,
         "content": content,
         "entities": entities
-    })
+    }), etag)
+
+
+def _with_etag(response, etag: str):
+    """Tag a response for conditional GETs; clients revalidate before reuse."""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def _not_modified(etag: str):
+    return _with_etag(app.response_class(status=304), etag)
 
 
 @app.route('/api/v1/entities', methods=['GET'])
@@ -193,6 +264,8 @@ def query_entities():
     - type: Filter by entity type (Product, PriceSpecification, etc.)
     - q: Search text in properties
     - limit: Max results (default 50)
+    - detail: "full" (default) or "summary" - summary returns only the
+      indexed value/name fields instead of full properties (type queries)
     
     Examples:
     - GET /api/v1/entities?type=Product
@@ -202,15 +275,16 @@ def query_entities():
     entity_type = request.args.get('type')
     query = request.args.get('q')
     limit = int(request.args.get('limit', 50))
+    detail = request.args.get('detail', 'full')
     
     if query:
         entities = storage.search_entities(query, entity_type, limit)
     elif entity_type:
-        entities = storage.get_entities_by_type(entity_type, limit)
+        entities = storage.get_entities_by_type(entity_type, limit, detail)
     else:
-        return jsonify({"error": "Provide 'type' or 'q' parameter"}), 400
+        return ojsonify({"error": "Provide 'type' or 'q' parameter"}), 400
     
-    return jsonify({
+    return ojsonify({
         "count": len(entities),
         "entities": entities
     })
@@ -219,7 +293,7 @@ def query_entities():
 @app.route('/api/v1/stats', methods=['GET'])
 def get_stats():
     """Get storage statistics."""
-    return jsonify(storage.get_stats())
+    return ojsonify(storage.get_stats())
 
 
 @app.route('/api/v1/envelope/<envelope_id>', methods=['DELETE'])
@@ -228,9 +302,9 @@ def delete_envelope(envelope_id: str):
     deleted = storage.delete_envelope(envelope_id)
     
     if not deleted:
-        return jsonify({"error": f"Envelope '{envelope_id}' not found"}), 404
+        return ojsonify({"error": f"Envelope '{envelope_id}' not found"}), 404
     
-    return jsonify({"deleted": envelope_id})
+    return ojsonify({"deleted": envelope_id})
 
 
 # n8n-friendly batch endpoint
@@ -243,11 +317,13 @@ def batch_process():
     {
         "documents": [
             {"content": "...", "source": "doc1.pdf"},
-            {"content": "...", "source": "doc2.pdf"}
+            {"content": "...", "source": "doc2.md", "content_type": "markdown"}
         ],
         "content_type": "html"
     }
     
+    A document's own "content_type" overrides the batch-level one.
+    
     Response:
     {
         "processed": 2,
@@ -256,53 +332,142 @@ def batch_process():
             {"envelope_id": "...", "token_count": 432, ...}
         ]
     }
+    
+    With "stream": true in the body, results are streamed as NDJSON
+    (application/x-ndjson) as each document finishes: one result object
+    per line, with its position in "documents" as "index", followed by a
+    final {"processed": ..., "failed": ...} line. Each envelope is stored
+    as soon as it is processed.
+    
+    As with /process, documents already processed from the same input are
+    answered from storage ("deduplicated": true) without re-running the
+    pipeline.
     """
     data = request.get_json()
     
     if not data or 'documents' not in data:
-        return jsonify({"error": "Missing 'documents' array"}), 400
+        return ojsonify({"error": "Missing 'documents' array"}), 400
     
     documents = data['documents']
     content_type = data.get('content_type', 'html')
     
-    results = []
-    for doc in documents:
-        try:
-            content = doc.get('content', '')
-            source = doc.get('source', 'unknown')
-            
-            if content_type == 'html':
-                result = pipeline.process_with_report(content, source, 'web')
-            else:
-                envelope = pipeline.process_markdown(content, source, 'markdown')
-                result = {"envelope": envelope}
-            
-            envelope = result['envelope']
-            storage.store_envelope(envelope)
-            
-            results.append({
-                "envelope_id": envelope.id,
-                "source": source,
-                "token_count": envelope.narrative.token_count,
-                "noise_score": envelope.narrative.noise_score,
-                "anchors": len(envelope.anchors),
-                "entities": len(envelope.entities),
-                "status": "success"
-            })
-        except Exception as e:
-            results.append({
-                "source": doc.get('source', 'unknown'),
-                "status": "error",
-                "error": str(e)
-            })
+    if data.get('stream'):
+        return app.response_class(_stream_batch(documents, content_type),
+                                  mimetype='application/x-ndjson')
+    
+    results = [None] * len(documents)
+    envelopes = {}
+    for i, envelope, content_hash, result in _run_batch(documents, content_type):
+        results[i] = result
+        if envelope is not None:
+            envelopes[i] = (envelope, content_hash)
     
-    return jsonify({
+    # Store every processed envelope in one transaction
+    try:
+        order = sorted(envelopes)
+        storage.store_envelopes([envelopes[i][0] for i in order],
+                                [envelopes[i][1] for i in order])
+    except Exception as e:
+        for i in envelopes:
+            results[i] = _batch_error(documents[i], e)
+    
+    return ojsonify({
         "processed": len([r for r in results if r['status'] == 'success']),
         "failed": len([r for r in results if r['status'] == 'error']),
         "results": results
     })
 
 
+def _stream_batch(documents: list, content_type: str):
+    """Yield NDJSON lines for a batch, storing each envelope as it completes."""
+    processed = failed = 0
+    for i, envelope, content_hash, result in _run_batch(documents, content_type):
+        if envelope is not None:
+            try:
+                storage.store_envelope(envelope, content_hash)
+            except Exception as e:
+                result = _batch_error(documents[i], e)
+        
+        if result['status'] == 'success':
+            processed += 1
+        else:
+            failed += 1
+        yield _json_line({"index": i, **result})
+    
+    yield _json_line({"processed": processed, "failed": failed})
+
+
+def _run_batch(documents: list, content_type: str):
+    """
+    Process batch documents in the worker pool.
+    
+    Yields (index, envelope or None, content hash, result): documents
+    answered without the pool (already in storage, or invalid) come first
+    and carry no envelope, then the processed ones in completion order.
+    """
+    def doc_type(i):
+        return documents[i].get('content_type', content_type)
+    
+    # Fan documents out to the worker pool, grouped by content type so
+    # workers run one kind of document back to back
+    futures = {}
+    hashes = {}
+    ready = []  # answered without the pool: stored duplicates, bad input
+    for i in sorted(range(len(documents)), key=doc_type):
+        doc = documents[i]
+        content = doc.get('content', '')
+        source = doc.get('source', 'unknown')
+        try:
+            hashes[i] = content_fingerprint(content, source, doc_type(i))
+            existing = storage.get_envelope_by_content_hash(hashes[i])
+        except Exception as e:
+            ready.append((i, None, None, _batch_error(doc, e)))
+            continue
+        
+        if existing is not None:
+            ready.append((i, None, hashes[i], {
+                "envelope_id": existing["id"],
+                "source": source,
+                "token_count": existing["narrative"]["token_count"],
+                "noise_score": existing["narrative"]["noise_score"],
+                "anchors": len(existing["anchors"]),
+                "entities": len(existing["structure"]["entities"]),
+                "status": "success",
+                "deduplicated": True
+            }))
+            continue
+        
+        future = workers.submit(content, source, doc_type(i))
+        futures[future] = i
+    
+    yield from ready
+    
+    for future in as_completed(futures):
+        i = futures[future]
+        try:
+            envelope = future.result()['envelope']
+        except Exception as e:
+            yield i, None, hashes[i], _batch_error(documents[i], e)
+            continue
+        
+        yield i, envelope, hashes[i], {
+            "envelope_id": envelope.id,
+            "source": documents[i].get('source', 'unknown'),
+            "token_count": envelope.narrative.token_count,
+            "noise_score": envelope.narrative.noise_score,
+            "anchors": len(envelope.anchors),
+            "entities": len(envelope.entities),
+            "status": "success"
+        }
+
+
+def _batch_error(doc: dict, error: Exception) -> dict:
+    return {
+        "source": doc.get('source', 'unknown'),
+        "status": "error",
+        "error": str(error)
+    }
+
 if __name__ == '__main__':
     port = int(os.environ.get('ECR_PORT', 5000))
     debug = os.environ.get('ECR_DEBUG', 'false').lower() == 'true'
@@ -321,6 +486,8 @@ if __name__ == '__main__':
     ║    GET  /health             - Health check                ║
     ╠═══════════════════════════════════════════════════════════╣
     ║  Running on: http://localhost:{port}                       ║
+    ║  Development server - for production use:                 ║
+    ║    gunicorn aio_api.server:app                            ║
     ╚═══════════════════════════════════════════════════════════╝
     """)
     
@@ -11,13 +11,189 @@ Why SQLite:
 For high-traffic production, add Redis caching on top.
 """
 
+import hashlib
 import sqlite3
 import json
+import threading
+import zlib
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional
 from datetime import datetime
 from contextlib import contextmanager
 
+# Optional: orjson encodes/decodes envelopes several times faster
+try:
+    import orjson
+    
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+    
+    _dumps_bytes = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    _dumps = json.dumps
+    
+    def _dumps_bytes(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+    
+    _loads = json.loads
+
+# zlib level for stored envelope JSON (decompression speed is level-independent)
+ENVELOPE_COMPRESSION_LEVEL = 6
+
+# Applied once per connection: WAL lets readers proceed during writes
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+# Read-only connections used by the lookup methods; a larger mmap window so
+# hot pages are read straight from the mapping
+_READ_PRAGMAS = (
+    "PRAGMA query_only=1",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=1073741824",
+    "PRAGMA cache_size=-65536",
+)
+
+# Prepared statements kept per connection (sqlite3 default: 128)
+CACHED_STATEMENTS = 256
+
+# Hot-path lookup statements, defined once so every call passes identical SQL
+# text and is served from the connection's prepared-statement cache
+_SQL_GET_ENVELOPE = "SELECT envelope_json FROM envelopes WHERE envelope_id = ?"
+_SQL_GET_ENVELOPE_VERSION = "SELECT narrative_hash, created_at FROM envelopes WHERE envelope_id = ?"
+_SQL_FIND_CONTENT_HASH = "SELECT envelope_id FROM envelopes WHERE content_hash = ?"
+_SQL_GET_ANCHOR = """
+    SELECT a.char_start, a.line_start, a.line_end,
+           CASE WHEN a.char_start IS NULL THEN e.narrative_text
+                ELSE SUBSTR(e.narrative_text, a.char_start + 1,
+                            a.char_end - a.char_start)
+           END AS text
+    FROM anchors a
+    JOIN envelopes e ON e.envelope_id = a.envelope_id
+    WHERE a.envelope_id = ? AND a.anchor_id = ?
+"""
+_SQL_ENTITIES_BY_TYPE_SUMMARY = """
+    SELECT envelope_id, entity_type, anchor_ref, value, name,
+           binding_confidence
+    FROM entities
+    WHERE entity_type = ?
+    LIMIT ?
+"""
+_SQL_ENTITIES_BY_TYPE = """
+    SELECT envelope_id, entity_type, anchor_ref, properties_json,
+           binding_confidence
+    FROM entities
+    WHERE entity_type = ?
+    LIMIT ?
+"""
+_SQL_ENTITIES_BY_ANCHOR = """
+    SELECT id, entity_type, properties_json, binding_confidence
+    FROM entities
+    WHERE envelope_id = ? AND anchor_ref = ?
+"""
+_SQL_SEARCH_FTS = """
+    SELECT e.envelope_id, e.entity_type, e.anchor_ref, e.properties_json
+    FROM entities_fts f
+    JOIN entities e ON e.id = f.rowid
+    WHERE entities_fts MATCH ?
+      AND (? IS NULL OR e.entity_type = ?)
+    ORDER BY bm25(entities_fts)
+    LIMIT ?
+"""
+_SQL_SEARCH_WITH_TYPE = """
+    SELECT envelope_id, entity_type, anchor_ref, properties_json
+    FROM entities
+    WHERE entity_type = ? AND properties_json LIKE ?
+    LIMIT ?
+"""
+_SQL_SEARCH_NO_TYPE = """
+    SELECT envelope_id, entity_type, anchor_ref, properties_json
+    FROM entities
+    WHERE properties_json LIKE ?
+    LIMIT ?
+"""
+
+# Top-level entity property keys exposed as generated columns on entities
+ENTITY_VALUE_COLUMNS = ("value", "name")
+
+# Entries kept by the in-process lookup caches (envelopes are larger)
+ANCHOR_CACHE_SIZE = 10000
+ENVELOPE_CACHE_SIZE = 256
+
+_MISSING = object()
+
+
+def content_fingerprint(content: str, source: str, content_type: str) -> str:
+    """Fingerprint of a processing request's input, for skipping repeats."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{content_type}\0{source}\0".encode('utf-8'))
+    h.update(content.encode('utf-8'))
+    return h.hexdigest()
+
+
+def _decode_envelope(stored) -> dict:
+    """Decode envelope_json: a zlib-compressed BLOB, or TEXT in older rows."""
+    if isinstance(stored, bytes):
+        stored = zlib.decompress(stored)
+    return _loads(stored)
+
+
+def _line_offsets(text: str) -> list[int]:
+    """Start offset of every line in text, plus len(text) + 1 at the end."""
+    offsets = [0]
+    pos = text.find('\n')
+    while pos != -1:
+        offsets.append(pos + 1)
+        pos = text.find('\n', pos + 1)
+    offsets.append(len(text) + 1)
+    return offsets
+
+
+def _char_range(offsets: list[int], line_start: int, line_end: int) -> tuple[int, int]:
+    """Character range equal to '\\n'.join(lines[line_start:line_end + 1])."""
+    last = len(offsets) - 1  # number of lines
+    start = offsets[line_start] if line_start < last else offsets[last] - 1
+    end = offsets[min(line_end + 1, last)] - 1
+    return start, max(start, end)
+
+
+class _LRUCache:
+    """
+    Small thread-safe LRU map for lookup results.
+    
+    Keys include the envelope's stored version, so entries superseded by a
+    re-store or delete are never hit again and simply age out. Cached
+    values are shared between callers and must be treated as read-only.
+    """
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: tuple, default=None):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+    
+    def put(self, key: tuple, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
 
 class EnvelopeStorage:
     """
@@ -27,6 +203,12 @@ class EnvelopeStorage:
     - envelopes: Full envelope JSON + metadata
     - anchors: Individual anchors for fast lookup
     - entities: Extracted entities for structured queries
+    
+    Envelope, anchor-content and anchor-entity lookups are memoized in
+    per-process LRU caches keyed on the envelope's stored version (narrative
+    hash and store time). Each lookup first reads that version by primary
+    key, so a re-store or delete made by another process (e.g. another
+    gunicorn worker) is never answered from a stale entry.
     """
     
     def __init__(self, db_path: str = "envelopes.db"):
@@ -37,12 +219,17 @@ class EnvelopeStorage:
             db_path: Path to SQLite database file
         """
         self.db_path = Path(db_path)
+        # One long-lived connection per thread instead of connect/close per call
+        self._local = threading.local()
+        self._envelope_cache = _LRUCache(ENVELOPE_CACHE_SIZE)
+        self._anchor_cache = _LRUCache(ANCHOR_CACHE_SIZE)
         self._init_db()
     
     def _init_db(self):
         """Create tables if they don't exist."""
         with self._get_conn() as conn:
             conn.executescript("""
+                -- envelope_json holds zlib-compressed JSON (BLOB values)
                 CREATE TABLE IF NOT EXISTS envelopes (
                     envelope_id TEXT PRIMARY KEY,
                     source_uri TEXT NOT NULL,
@@ -51,7 +238,8 @@ class EnvelopeStorage:
                     token_count INTEGER,
                     noise_score REAL,
                     narrative_hash TEXT,
-                    envelope_json TEXT NOT NULL
+                    envelope_json TEXT NOT NULL,
+                    narrative_text TEXT
                 );
                 
                 CREATE TABLE IF NOT EXISTS anchors (
@@ -62,7 +250,8 @@ class EnvelopeStorage:
                     title TEXT,
                     line_start INTEGER,
                     line_end INTEGER,
-                    content TEXT,
+                    char_start INTEGER,
+                    char_end INTEGER,
                     FOREIGN KEY (envelope_id) REFERENCES envelopes(envelope_id),
                     UNIQUE(envelope_id, anchor_id)
                 );
@@ -86,142 +275,412 @@ class EnvelopeStorage:
                     ON entities(envelope_id);
                 CREATE INDEX IF NOT EXISTS idx_entities_type 
                     ON entities(entity_type);
-                CREATE INDEX IF NOT EXISTS idx_entities_anchor 
-                    ON entities(anchor_ref);
                 CREATE INDEX IF NOT EXISTS idx_envelopes_source 
                     ON envelopes(source_uri);
             """)
+            
+            # Anchor content is sliced from the envelope's narrative on read
+            # rather than stored per anchor; migrate databases that did
+            self._ensure_column(conn, "envelopes", "narrative_text",
+                                "narrative_text TEXT")
+            self._drop_anchor_content(conn)
+            
+            # Character range of each anchor in narrative_text (NULL in rows
+            # stored before these columns existed)
+            self._ensure_column(conn, "anchors", "char_start", "char_start INTEGER")
+            self._ensure_column(conn, "anchors", "char_end", "char_end INTEGER")
+            
+            # Fingerprint of the raw input each envelope was built from
+            self._ensure_column(conn, "envelopes", "content_hash",
+                                "content_hash TEXT")
+            
+            # Hot property keys as generated columns, so type-filtered
+            # lookups are index range scans and need no JSON decoding
+            for column in ENTITY_VALUE_COLUMNS:
+                self._ensure_column(
+                    conn, "entities", column,
+                    f"{column} GENERATED ALWAYS AS "
+                    f"(json_extract(properties_json, '$.{column}')) VIRTUAL"
+                )
+            conn.executescript("""
+                CREATE INDEX IF NOT EXISTS idx_entities_type_value 
+                    ON entities(entity_type, value);
+                CREATE INDEX IF NOT EXISTS idx_entities_type_envelope 
+                    ON entities(entity_type, envelope_id);
+                CREATE INDEX IF NOT EXISTS idx_envelopes_content_hash 
+                    ON envelopes(content_hash);
+                
+                -- Covering index: anchor-entity lookups are answered from
+                -- the index without touching table rows
+                CREATE INDEX IF NOT EXISTS idx_entities_envelope_anchor_cover 
+                    ON entities(envelope_id, anchor_ref, entity_type,
+                                binding_confidence, properties_json);
+                DROP INDEX IF EXISTS idx_entities_anchor;
+            """)
+            self._fts = self._init_fts(conn)
+    
+    def _drop_anchor_content(self, conn: sqlite3.Connection):
+        """Backfill narrative_text and drop the old per-anchor content copy."""
+        columns = {row['name'] for row in conn.execute("PRAGMA table_xinfo(anchors)")}
+        if "content" not in columns:
+            return
+        conn.execute("""
+            UPDATE envelopes
+            SET narrative_text = json_extract(envelope_json, '$.narrative.content')
+            WHERE narrative_text IS NULL
+        """)
+        try:
+            conn.execute("ALTER TABLE anchors DROP COLUMN content")
+        except sqlite3.OperationalError:
+            pass  # SQLite < 3.35: the column stays, new rows leave it NULL
+    
+    def _ensure_column(self, conn: sqlite3.Connection, table: str,
+                       column: str, definition: str):
+        """Add a column to an existing table unless it is already there."""
+        # table_xinfo (unlike table_info) also lists generated columns
+        columns = {row['name'] for row in conn.execute(f"PRAGMA table_xinfo({table})")}
+        if column not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {definition}")
+    
+    def _init_fts(self, conn: sqlite3.Connection) -> bool:
+        """
+        Create the full-text index over entity properties.
+        
+        An external-content FTS5 table with the trigram tokenizer, so
+        substring searches are served from the index. Kept in sync by
+        triggers. Returns False (LIKE scans are used) when this SQLite
+        build has no FTS5/trigram support.
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'entities_fts'"
+        ).fetchone()
+        try:
+            conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS entities_fts USING fts5(
+                    properties_json,
+                    content='entities', content_rowid='id',
+                    tokenize='trigram'
+                );
+                
+                CREATE TRIGGER IF NOT EXISTS entities_fts_insert
+                AFTER INSERT ON entities BEGIN
+                    INSERT INTO entities_fts(rowid, properties_json)
+                    VALUES (new.id, new.properties_json);
+                END;
+                
+                CREATE TRIGGER IF NOT EXISTS entities_fts_delete
+                AFTER DELETE ON entities BEGIN
+                    INSERT INTO entities_fts(entities_fts, rowid, properties_json)
+                    VALUES ('delete', old.id, old.properties_json);
+                END;
+                
+                CREATE TRIGGER IF NOT EXISTS entities_fts_update
+                AFTER UPDATE OF properties_json ON entities BEGIN
+                    INSERT INTO entities_fts(entities_fts, rowid, properties_json)
+                    VALUES ('delete', old.id, old.properties_json);
+                    INSERT INTO entities_fts(rowid, properties_json)
+                    VALUES (new.id, new.properties_json);
+                END;
+            """)
+        except sqlite3.OperationalError:
+            return False
+        
+        if not exists:
+            # Index entities stored before the FTS table existed
+            conn.execute("INSERT INTO entities_fts(entities_fts) VALUES ('rebuild')")
+        return True
+    
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening and configuring it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                   isolation_level=None,
+                                   cached_statements=CACHED_STATEMENTS)
+            conn.row_factory = sqlite3.Row
+            for pragma in _PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+        return conn
     
     @contextmanager
     def _get_conn(self):
-        """Get database connection with auto-commit."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Get database connection (autocommit; use _transaction for writes)."""
+        yield self._conn()
+    
+    @contextmanager
+    def _read_conn(self):
+        """
+        Get this thread's read-only connection.
+        
+        Opened with mode=ro and query_only, separate from the writer, so
+        lookups never queue behind a write transaction (WAL readers see
+        the last committed state).
+        """
+        conn = getattr(self._local, 'ro', None)
+        if conn is None:
+            uri = f"{self.db_path.resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False,
+                                   isolation_level=None,
+                                   cached_statements=CACHED_STATEMENTS)
+            conn.row_factory = sqlite3.Row
+            for pragma in _READ_PRAGMAS:
+                conn.execute(pragma)
+            self._local.ro = conn
+        yield conn
+    
+    @contextmanager
+    def _transaction(self):
+        """Run a group of writes in one transaction, committed with one sync."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
         try:
             yield conn
-            conn.commit()
-        finally:
-            conn.close()
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    
+    def close(self):
+        """Close the calling thread's connections."""
+        for name in ('conn', 'ro'):
+            conn = getattr(self._local, name, None)
+            if conn is not None:
+                conn.close()
+                setattr(self._local, name, None)
 
-    def store_envelope(self, envelope) -> str:
+    def store_envelope(self, envelope, content_hash: Optional[str] = None,
+                       envelope_dict: Optional[dict] = None) -> str:
         """
         Store an envelope and its components.
         
         Args:
             envelope: AIO Envelope object
+            content_hash: content_fingerprint() of the input it was built from
+            envelope_dict: envelope.to_dict(), if the caller already has it
             
         Returns:
             envelope_id
         """
-        envelope_dict = envelope.to_dict()
+        with self._transaction() as conn:
+            self._write_envelope(conn, envelope, datetime.utcnow().isoformat(),
+                                 content_hash, envelope_dict)
         
-        with self._get_conn() as conn:
-            # Store main envelope
-            conn.execute("""
-                INSERT OR REPLACE INTO envelopes 
-                (envelope_id, source_uri, source_type, created_at, 
-                 token_count, noise_score, narrative_hash, envelope_json)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                envelope.id,
-                envelope.source.uri,
-                envelope.source.type,
-                datetime.utcnow().isoformat(),
-                envelope.narrative.token_count,
-                envelope.narrative.noise_score,
-                envelope.integrity.narrative_hash,
-                json.dumps(envelope_dict)
-            ))
-            
-            # Delete old anchors/entities for this envelope (for updates)
-            conn.execute("DELETE FROM anchors WHERE envelope_id = ?", 
-                        (envelope.id,))
-            conn.execute("DELETE FROM entities WHERE envelope_id = ?", 
-                        (envelope.id,))
-            
-            # Store anchors with content
-            narrative_lines = envelope.narrative.content.split('\n')
-            for anchor_id, anchor in envelope.anchors.items():
-                content = '\n'.join(
-                    narrative_lines[anchor.line_start:anchor.line_end + 1]
-                )
-                conn.execute("""
-                    INSERT INTO anchors 
-                    (envelope_id, anchor_id, anchor_type, title, 
-                     line_start, line_end, content)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    envelope.id,
-                    anchor_id,
-                    anchor.type,
-                    anchor.title,
-                    anchor.line_start,
-                    anchor.line_end,
-                    content
-                ))
+        return envelope.id
+    
+    def store_envelopes(self, envelopes: list,
+                        content_hashes: Optional[list] = None) -> list[str]:
+        """
+        Store several envelopes in a single transaction.
+        
+        Args:
+            envelopes: AIO Envelope objects
+            content_hashes: content_fingerprint() of each envelope's input,
+                            in the same order (None entries allowed)
             
-            # Store entities
-            for entity in envelope.entities:
-                conn.execute("""
-                    INSERT INTO entities 
-                    (envelope_id, entity_type, anchor_ref, properties_json,
-                     source_text, binding_confidence)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    envelope.id,
-                    entity.type,
-                    entity.anchor_ref,
-                    json.dumps(entity.properties),
-                    entity.properties.get('_source', {}).get('text', ''),
-                    entity.binding_confidence
-                ))
+        Returns:
+            envelope_ids, in input order
+        """
+        if content_hashes is None:
+            content_hashes = [None] * len(envelopes)
         
-        return envelope.id
+        created_at = datetime.utcnow().isoformat()
+        with self._transaction() as conn:
+            for envelope, content_hash in zip(envelopes, content_hashes):
+                self._write_envelope(conn, envelope, created_at, content_hash)
+        
+        return [envelope.id for envelope in envelopes]
+    
+    def _write_envelope(self, conn: sqlite3.Connection, envelope, created_at: str,
+                        content_hash: Optional[str] = None,
+                        envelope_dict: Optional[dict] = None):
+        """Write one envelope's rows (inside the caller's transaction)."""
+        if envelope_dict is None:
+            envelope_dict = envelope.to_dict()
+        
+        # Store main envelope
+        conn.execute("""
+            INSERT OR REPLACE INTO envelopes 
+            (envelope_id, source_uri, source_type, created_at, 
+             token_count, noise_score, narrative_hash, envelope_json,
+             narrative_text, content_hash)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            envelope.id,
+            envelope.source.uri,
+            envelope.source.type,
+            created_at,
+            envelope.narrative.token_count,
+            envelope.narrative.noise_score,
+            envelope.integrity.narrative_hash,
+            zlib.compress(_dumps_bytes(envelope_dict), ENVELOPE_COMPRESSION_LEVEL),
+            envelope.narrative.content,
+            content_hash
+        ))
+        
+        # Delete old anchors/entities for this envelope (for updates)
+        conn.execute("DELETE FROM anchors WHERE envelope_id = ?", 
+                    (envelope.id,))
+        conn.execute("DELETE FROM entities WHERE envelope_id = ?", 
+                    (envelope.id,))
+        
+        # Store anchors as line ranges plus the matching character range of
+        # narrative_text, from one pass over the narrative's line offsets
+        offsets = _line_offsets(envelope.narrative.content)
+        anchor_rows = [
+            (
+                envelope.id,
+                anchor_id,
+                anchor.type,
+                anchor.title,
+                anchor.line_start,
+                anchor.line_end,
+                *_char_range(offsets, anchor.line_start, anchor.line_end)
+            )
+            for anchor_id, anchor in envelope.anchors.items()
+        ]
+        conn.executemany("""
+            INSERT INTO anchors 
+            (envelope_id, anchor_id, anchor_type, title, 
+             line_start, line_end, char_start, char_end)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, anchor_rows)
+        
+        # Store entities
+        entity_rows = [
+            (
+                envelope.id,
+                entity.type,
+                entity.anchor_ref,
+                _dumps(entity.properties),
+                entity.properties.get('_source', {}).get('text', ''),
+                entity.binding_confidence
+            )
+            for entity in envelope.entities
+        ]
+        conn.executemany("""
+            INSERT INTO entities 
+            (envelope_id, entity_type, anchor_ref, properties_json,
+             source_text, binding_confidence)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, entity_rows)
+    
+    
+    def _version(self, conn: sqlite3.Connection, envelope_id: str) -> Optional[tuple]:
+        """(narrative_hash, created_at) of a stored envelope, or None if missing."""
+        row = conn.execute(_SQL_GET_ENVELOPE_VERSION, (envelope_id,)).fetchone()
+        if row is None:
+            return None
+        return row['narrative_hash'], row['created_at']
     
     def get_envelope(self, envelope_id: str) -> Optional[dict]:
         """Get full envelope by ID."""
-        with self._get_conn() as conn:
-            row = conn.execute(
-                "SELECT envelope_json FROM envelopes WHERE envelope_id = ?",
-                (envelope_id,)
-            ).fetchone()
+        with self._read_conn() as conn:
+            version = self._version(conn, envelope_id)
+            if version is None:
+                return None
+            
+            key = (envelope_id, version)
+            envelope = self._envelope_cache.get(key)
+            if envelope is not None:
+                return envelope
+            
+            row = conn.execute(_SQL_GET_ENVELOPE, (envelope_id,)).fetchone()
             
             if row:
-                return json.loads(row['envelope_json'])
+                envelope = _decode_envelope(row['envelope_json'])
+                self._envelope_cache.put(key, envelope)
+                return envelope
             return None
     
+    def get_envelope_etag(self, envelope_id: str) -> Optional[str]:
+        """
+        Version tag for a stored envelope, without loading it.
+        
+        Derived from its narrative hash and store time, so it changes
+        whenever the envelope is stored again. None if it does not exist.
+        """
+        with self._read_conn() as conn:
+            version = self._version(conn, envelope_id)
+        
+        if version is None:
+            return None
+        narrative_hash, created_at = version
+        version = f"{envelope_id}\0{narrative_hash}\0{created_at}"
+        return hashlib.blake2b(version.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def get_envelope_by_content_hash(self, content_hash: str) -> Optional[dict]:
+        """Get the stored envelope built from input with this fingerprint."""
+        with self._read_conn() as conn:
+            row = conn.execute(_SQL_FIND_CONTENT_HASH, (content_hash,)).fetchone()
+        
+        if row:
+            return self.get_envelope(row['envelope_id'])
+        return None
+    
     def get_anchor_content(self, envelope_id: str, anchor_id: str) -> Optional[str]:
         """Get content for a specific anchor."""
         # Strip # prefix if present
         anchor_id = anchor_id.lstrip('#')
         
-        with self._get_conn() as conn:
-            row = conn.execute(
-                "SELECT content FROM anchors WHERE envelope_id = ? AND anchor_id = ?",
-                (envelope_id, anchor_id)
-            ).fetchone()
+        with self._read_conn() as conn:
+            version = self._version(conn, envelope_id)
+            if version is None:
+                return None
             
-            if row:
-                return row['content']
+            key = (envelope_id, version, 'content', anchor_id)
+            content = self._anchor_cache.get(key)
+            if content is not None:
+                return content
+            
+            # Only the anchor's substring leaves SQLite, unless the row
+            # predates char ranges and the lines must be split out here
+            row = conn.execute(_SQL_GET_ANCHOR, (envelope_id, anchor_id)).fetchone()
+            
+            if row and row['text'] is not None:
+                content = row['text']
+                if row['char_start'] is None:
+                    lines = content.split('\n')
+                    content = '\n'.join(lines[row['line_start']:row['line_end'] + 1])
+                self._anchor_cache.put(key, content)
+                return content
             return None
 
-    def get_entities_by_type(self, entity_type: str, limit: int = 100) -> list[dict]:
-        """Query entities by type across all envelopes."""
-        with self._get_conn() as conn:
-            rows = conn.execute("""
-                SELECT envelope_id, entity_type, anchor_ref, properties_json,
-                       binding_confidence
-                FROM entities 
-                WHERE entity_type = ?
-                LIMIT ?
-            """, (entity_type, limit)).fetchall()
+    def get_entities_by_type(self, entity_type: str, limit: int = 100,
+                             detail: str = "full") -> list[dict]:
+        """
+        Query entities by type across all envelopes.
+        
+        Args:
+            entity_type: Entity type to match
+            limit: Max results
+            detail: "full" returns decoded properties; "summary" returns only
+                    the indexed value/name columns, skipping JSON parsing
+        """
+        with self._read_conn() as conn:
+            if detail != "full":
+                rows = conn.execute(_SQL_ENTITIES_BY_TYPE_SUMMARY, (entity_type, limit)).fetchall()
+                
+                return [
+                    {
+                        "envelope_id": row['envelope_id'],
+                        "type": row['entity_type'],
+                        "anchor_ref": row['anchor_ref'],
+                        "value": row['value'],
+                        "name": row['name'],
+                        "binding_confidence": row['binding_confidence']
+                    }
+                    for row in rows
+                ]
+            
+            rows = conn.execute(_SQL_ENTITIES_BY_TYPE, (entity_type, limit)).fetchall()
             
             return [
                 {
                     "envelope_id": row['envelope_id'],
                     "type": row['entity_type'],
                     "anchor_ref": row['anchor_ref'],
-                    "properties": json.loads(row['properties_json']),
+                    "properties": _loads(row['properties_json']),
                     "binding_confidence": row['binding_confidence']
                 }
                 for row in rows
@@ -231,21 +690,32 @@ class EnvelopeStorage:
         """Get all entities linked to a specific anchor."""
         anchor_ref = f"#{anchor_id}" if not anchor_id.startswith('#') else anchor_id
         
-        with self._get_conn() as conn:
-            rows = conn.execute("""
-                SELECT entity_type, properties_json, binding_confidence
-                FROM entities 
-                WHERE envelope_id = ? AND anchor_ref = ?
-            """, (envelope_id, anchor_ref)).fetchall()
+        with self._read_conn() as conn:
+            version = self._version(conn, envelope_id)
+            if version is None:
+                return []
             
-            return [
+            key = (envelope_id, version, 'entities', anchor_ref)
+            entities = self._anchor_cache.get(key, _MISSING)
+            if entities is not _MISSING:
+                return entities
+            
+            rows = conn.execute(_SQL_ENTITIES_BY_ANCHOR, (envelope_id, anchor_ref)).fetchall()
+            
+            # Insertion order, sorted here: an ORDER BY id makes the planner
+            # leave the covering index for idx_entities_envelope
+            rows.sort(key=lambda row: row['id'])
+            
+            entities = [
                 {
                     "type": row['entity_type'],
-                    "properties": json.loads(row['properties_json']),
+                    "properties": _loads(row['properties_json']),
                     "binding_confidence": row['binding_confidence']
                 }
                 for row in rows
             ]
+            self._anchor_cache.put(key, entities)
+            return entities
     
     def search_entities(self, query: str, entity_type: str = None, 
                        limit: int = 50) -> list[dict]:
@@ -257,35 +727,32 @@ class EnvelopeStorage:
             entity_type: Optional filter by type
             limit: Max results
         """
-        with self._get_conn() as conn:
-            if entity_type:
-                rows = conn.execute("""
-                    SELECT envelope_id, entity_type, anchor_ref, properties_json
-                    FROM entities 
-                    WHERE entity_type = ? AND properties_json LIKE ?
-                    LIMIT ?
-                """, (entity_type, f'%{query}%', limit)).fetchall()
+        with self._read_conn() as conn:
+            # Trigram index needs 3+ characters; shorter terms scan with LIKE
+            if self._fts and len(query) >= 3:
+                # Quoted as one FTS phrase: a substring match like LIKE '%q%'
+                phrase = '"' + query.replace('"', '""') + '"'
+                rows = conn.execute(_SQL_SEARCH_FTS,
+                                    (phrase, entity_type, entity_type, limit)).fetchall()
+            elif entity_type:
+                rows = conn.execute(_SQL_SEARCH_WITH_TYPE,
+                                    (entity_type, f'%{query}%', limit)).fetchall()
             else:
-                rows = conn.execute("""
-                    SELECT envelope_id, entity_type, anchor_ref, properties_json
-                    FROM entities 
-                    WHERE properties_json LIKE ?
-                    LIMIT ?
-                """, (f'%{query}%', limit)).fetchall()
+                rows = conn.execute(_SQL_SEARCH_NO_TYPE, (f'%{query}%', limit)).fetchall()
             
             return [
                 {
                     "envelope_id": row['envelope_id'],
                     "type": row['entity_type'],
                     "anchor_ref": row['anchor_ref'],
-                    "properties": json.loads(row['properties_json'])
+                    "properties": _loads(row['properties_json'])
                 }
                 for row in rows
             ]
     
     def get_stats(self) -> dict:
         """Get storage statistics."""
-        with self._get_conn() as conn:
+        with self._read_conn() as conn:
             envelope_count = conn.execute(
                 "SELECT COUNT(*) as c FROM envelopes"
             ).fetchone()['c']
@@ -323,9 +790,10 @@ class EnvelopeStorage:
     
     def delete_envelope(self, envelope_id: str) -> bool:
         """Delete an envelope and all its components."""
-        with self._get_conn() as conn:
+        with self._transaction() as conn:
             conn.execute("DELETE FROM entities WHERE envelope_id = ?", (envelope_id,))
             conn.execute("DELETE FROM anchors WHERE envelope_id = ?", (envelope_id,))
             result = conn.execute("DELETE FROM envelopes WHERE envelope_id = ?", 
                                  (envelope_id,))
-            return result.rowcount > 0
+        
+        return result.rowcount > 0
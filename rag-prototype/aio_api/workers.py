@@ -0,0 +1,164 @@
+"""
+Pipeline Workers - Runs the CPU-bound pipeline in a process pool.
+
+Noise stripping, anchoring and entity extraction are pure Python, so
+concurrent requests in one server process serialize on the GIL. Documents
+are handed to a ProcessPoolExecutor instead; each worker process builds its
+own AIOPipeline once and returns the finished envelope to the server.
+
+Large documents are passed to workers through shared memory rather than
+being pickled into the pool's call queue.
+
+Configuration:
+- ECR_WORKERS: number of worker processes (default: CPU count,
+  0 = process inline in the request thread)
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+
+from aio_core.pipeline import AIOPipeline
+
+# Per-process pipeline, built lazily in each worker (or in the server when inline)
+_pipeline: Optional[AIOPipeline] = None
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+# Encoded documents at least this large go to workers via shared memory
+SHARED_MEMORY_THRESHOLD = 64 * 1024
+
+
+def _init_worker():
+    """Pool initializer: build the pipeline before the first document arrives."""
+    _get_pipeline()
+
+
+def _get_pipeline() -> AIOPipeline:
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = AIOPipeline()
+    return _pipeline
+
+
+def process_document(content: str, source: str, content_type: str = 'html') -> dict:
+    """
+    Run one document through the pipeline.
+    
+    Executes inside a worker process; the returned dict (envelope + report)
+    is pickled back to the caller.
+    """
+    pipeline = _get_pipeline()
+    
+    if content_type == 'html':
+        return pipeline.process_with_report(content, source, 'web')
+    
+    envelope = pipeline.process_markdown(content, source, 'markdown')
+    return {"envelope": envelope, "report": {
+        "noise_stripping": {
+            "noise_score": envelope.narrative.noise_score,
+            "final_tokens": envelope.narrative.token_count
+        }
+    }}
+
+
+def _process_shared(shm_name: str, size: int, source: str, content_type: str) -> dict:
+    """Worker side of a shared-memory submission: read the document, then process it."""
+    # Workers share the server's resource tracker, so attaching here does
+    # not add an owner; the submitting process unlinks the segment
+    shm = SharedMemory(name=shm_name)
+    try:
+        content = bytes(shm.buf[:size]).decode('utf-8')
+    finally:
+        shm.close()
+    return process_document(content, source, content_type)
+
+
+def get_pool() -> Optional[ProcessPoolExecutor]:
+    """Return the shared worker pool, starting it on first use (None if inline)."""
+    global _pool
+    if _pool is None:
+        workers = int(os.environ.get('ECR_WORKERS', os.cpu_count() or 1))
+        if workers <= 0:
+            return None
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                            mp_context=_mp_context())
+    return _pool
+
+
+def _discard_pool(broken: ProcessPoolExecutor) -> None:
+    """Drop a pool that lost a worker so the next get_pool() starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        # Another thread may already have replaced it
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _mp_context():
+    """
+    Start method for the worker pool.
+    
+    The pool starts on the first request, inside a threaded server worker;
+    forking a process with live threads can deadlock on locks those threads
+    hold, so workers come from a forkserver (spawn where that is missing).
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def submit(content: str, source: str, content_type: str = 'html') -> Future:
+    """Schedule a document for processing; returns a Future of process_document's result."""
+    pool = get_pool()
+    if pool is not None:
+        try:
+            return _submit_to(pool, content, source, content_type)
+        except BrokenProcessPool:
+            # A worker died (OOM kill, crash in a C extension) and took the
+            # pool with it; rebuild it and retry once
+            _discard_pool(pool)
+            return _submit_to(get_pool(), content, source, content_type)
+    
+    # Inline mode: same Future interface, computed in the calling thread
+    future = Future()
+    try:
+        future.set_result(process_document(content, source, content_type))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def _submit_to(pool: ProcessPoolExecutor, content: str, source: str,
+               content_type: str) -> Future:
+    if isinstance(content, str) and len(content) >= SHARED_MEMORY_THRESHOLD:
+        return _submit_shared(pool, content, source, content_type)
+    return pool.submit(process_document, content, source, content_type)
+
+
+def _submit_shared(pool: ProcessPoolExecutor, content: str, source: str,
+                   content_type: str) -> Future:
+    """Submit a large document through a shared-memory segment."""
+    data = content.encode('utf-8')
+    shm = SharedMemory(create=True, size=max(len(data), 1))
+    shm.buf[:len(data)] = data
+    
+    def release(_future):
+        shm.close()
+        shm.unlink()
+    
+    try:
+        future = pool.submit(_process_shared, shm.name, len(data), source, content_type)
+    except BaseException:
+        release(None)
+        raise
+    future.add_done_callback(release)
+    return future
@@ -3,6 +3,7 @@
 
 __version__ = "0.1.0"
 
+from .document_view import DocumentView
 from .envelope import Envelope, EnvelopeBuilder
 from .noise_stripper import NoiseStripper
 from .anchor_generator import AnchorGenerator
@@ -16,4 +17,5 @@ __all__ = [
     "AnchorGenerator",
     "StructureExtractor",
     "StructureBinder",
+    "DocumentView",
 ]
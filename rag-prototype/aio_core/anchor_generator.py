@@ -7,13 +7,135 @@ stable references that don't break when content is reorganized.
 
 The anchor ID format: anchor-{slug}-{hash8}
 - slug: human-readable portion from the section title
-- hash8: first 8 chars of SHA256 for uniqueness
+- hash8: 4-byte BLAKE2b tag (8 hex chars) for uniqueness
+
+The ID tag only has to tell anchors apart, so it uses BLAKE2b, which is
+cheaper than SHA256 on short inputs. Anchor content hashes (and the
+envelope's integrity hashes) stay SHA256, since they verify content.
 """
 
 import hashlib
 import re
+from bisect import bisect_right
+from collections.abc import Mapping
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Union
+
+from .document_view import DocumentView, as_view
+
+# Block openers, compiled once: one match per line tells generate() whether
+# the line is a header, a code fence or a bullet list item
+_BLOCK_RE = re.compile(
+    r'(?P<header>(?P<hashes>#{1,6})\s+(?P<title>.+))'
+    r'|(?P<fence>```(?P<lang>.*))'
+    r'|(?P<item>\s*[-*+]\s)'
+)
+# Whole-text scans: any header line (also ends sections when it has no
+# title) and any code fence line
+_HEADER_LINE_RE = re.compile(r'^(#{1,6})[^\S\n]', re.M)
+_FENCE_LINE_RE = re.compile(r'^```', re.M)
+# First characters that can open one of those blocks (bullet items may
+# also start with whitespace); other lines skip the regex entirely
+_BLOCK_FIRST_CHARS = frozenset('#`-*+')
+_TABLE_SEP_RE = re.compile(r'[\s|:-]+$')
+
+# Lines that end a block, searched for over the whole text (whitespace
+# classes exclude \n so a match never spills into the next line):
+# a table ends at the first line without a pipe...
+_TABLE_BREAK_RE = re.compile(r'^[^|\n]*$', re.M)
+# ...a list at the first non-blank line that is not a bullet item, an
+# indented continuation or a numbered item...
+_LIST_BREAK_RE = re.compile(
+    r'^(?![^\S\n]*[-*+][^\S\n]|[^\S\n]{2,}|[^\S\n]*\d+\.[^\S\n])[^\S\n]*\S', re.M
+)
+# ...and a paragraph at a blank line, header, fence, table row or bullet item
+_PARAGRAPH_BREAK_RE = re.compile(
+    r'^(?:[^\S\n]*$|#|```|\||[^\S\n]*[-*+][^\S\n])', re.M
+)
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+
+def _line_offsets(buf: bytes) -> list[int]:
+    """
+    Byte offset of the start of each line in UTF-8 encoded markdown.
+    
+    A final entry of len(buf) + 1 stands for the start of a virtual line
+    after the last one, so line i spans buf[offsets[i]:offsets[i + 1] - 1].
+    (0x0A never occurs inside a multi-byte UTF-8 sequence.)
+    """
+    offsets = [0]
+    find = buf.find
+    pos = find(b'\n')
+    while pos != -1:
+        offsets.append(pos + 1)
+        pos = find(b'\n', pos + 1)
+    offsets.append(len(buf) + 1)
+    return offsets
+
+
+def _block_end(pattern: re.Pattern, text: str, line_starts: list[int], start: int) -> int:
+    """
+    Last line of a block opened at line start: the line before the first
+    later line matching pattern, or the last line of the text.
+    """
+    n_lines = len(line_starts) - 1
+    if start + 1 < n_lines:
+        match = pattern.search(text, line_starts[start + 1])
+        if match:
+            return bisect_right(line_starts, match.start()) - 2
+    return n_lines - 1
+
+
+def _match_lines(pattern: re.Pattern, text: str):
+    """Yield (line number, match) for each match of a re.M pattern in text."""
+    line = 0
+    pos = 0
+    count = text.count
+    for match in pattern.finditer(text):
+        start = match.start()
+        line += count('\n', pos, start)
+        pos = start
+        yield line, match
+
+
+def _section_ends(markdown: str, n_lines: int) -> dict[int, int]:
+    """
+    Map each header line to the last line of its section.
+    
+    A section runs until the line before the next header of the same or
+    a higher level (or to the end of the document). One pass over the
+    header lines with a stack of still-open sections.
+    """
+    ends = {}
+    open_sections: list[tuple[int, int]] = []  # (line, level), levels ascending
+    for line, match in _match_lines(_HEADER_LINE_RE, markdown):
+        level = len(match.group(1))
+        while open_sections and open_sections[-1][1] >= level:
+            ends[open_sections.pop()[0]] = line - 1
+        open_sections.append((line, level))
+    for line, _ in open_sections:
+        ends[line] = n_lines - 1
+    return ends
+
+
+def _hash_ranges(buf: memoryview, ranges: list[tuple[int, int]]) -> list[str]:
+    """SHA256 hex digests of buf[start:end] for each (start, end) in ranges."""
+    sha256 = hashlib.sha256
+    return [sha256(buf[start:end]).hexdigest() for start, end in ranges]
+
+
+@lru_cache(maxsize=1024)
+def _id_seed(title: str):
+    """
+    Slug and an ID hasher already fed f"{title}:" for an anchor title.
+    
+    Seeds repeat a lot ("table", "list", "para", headings reused across a
+    document), so the slug regex and the title's share of the ID hash are
+    done once per title; callers copy() the hasher and append the rest.
+    """
+    slug = _SLUG_RE.sub('-', title.lower()).strip('-')[:20]
+    return slug, hashlib.blake2b(f"{title}:".encode(), digest_size=4)
 
 
 @dataclass
@@ -27,6 +149,53 @@ class Anchor:
     content_hash: Optional[str] = None  # Hash of the section content
 
 
+class AnchorData(Mapping):
+    """
+    Metadata for one generated anchor, as returned by AnchorGenerator.
+    
+    A slotted record (far smaller than a dict per anchor) that still reads
+    like the dicts generate() used to return: anchor["line_start"],
+    anchor.get("title") and dict(anchor) all work. "level" is only present
+    for sections.
+    """
+    __slots__ = ("line_start", "line_end", "type", "title", "level", "content_hash")
+    
+    def __init__(
+        self,
+        line_start: int,
+        line_end: int,
+        type: str,
+        title: Optional[str] = None,
+        level: Optional[int] = None,
+        content_hash: Optional[str] = None
+    ):
+        self.line_start = line_start
+        self.line_end = line_end
+        self.type = type
+        self.title = title
+        self.level = level
+        self.content_hash = content_hash
+    
+    def _keys(self) -> tuple[str, ...]:
+        if self.level is None:
+            return ("line_start", "line_end", "type", "title", "content_hash")
+        return self.__slots__
+    
+    def __getitem__(self, key: str):
+        if key in self._keys():
+            return getattr(self, key)
+        raise KeyError(key)
+    
+    def __iter__(self):
+        return iter(self._keys())
+    
+    def __len__(self) -> int:
+        return len(self._keys())
+    
+    def __repr__(self) -> str:
+        return f"AnchorData({dict(self)!r})"
+
+
 class AnchorGenerator:
     """
     Generates stable, hash-based anchors for markdown content.
@@ -50,128 +219,146 @@ class AnchorGenerator:
         """
         self.include_paragraphs = include_paragraphs
     
-    def generate(self, markdown: str) -> dict[str, dict]:
+    def generate(self, markdown: Union[str, DocumentView]) -> dict[str, AnchorData]:
         """
         Generate anchors for all significant content blocks.
         
         Args:
-            markdown: Clean markdown content
+            markdown: Clean markdown content (or a DocumentView of it)
             
         Returns:
             Dictionary mapping anchor IDs to anchor metadata
         """
-        anchors = {}
-        lines = markdown.split('\n')
+        view = as_view(markdown)
+        markdown = view.content
+        lines = view.lines
+        n_lines = len(lines)
+        
+        # Section ends and fence positions come from whole-text scans, so
+        # neither needs a forward line walk per block
+        section_ends = _section_ends(markdown, n_lines)
+        fence_lines = [line for line, _ in _match_lines(_FENCE_LINE_RE, markdown)]
+        # Tables, lists and paragraphs find their last line with one regex
+        # search from their first line rather than a Python loop over lines
+        line_starts = view.line_offsets
+        
+        # Pass 1 finds the blocks: (ID seed, anchor metadata without hash)
+        blocks: list[tuple[str, AnchorData]] = []
         
         # Track current section for nesting
         current_section: Optional[dict] = None
         section_stack: list[dict] = []
         
         i = 0
-        while i < len(lines):
+        while i < n_lines:
             line = lines[i]
+            first = line[:1]
+            if first in _BLOCK_FIRST_CHARS or first.isspace():
+                block = _BLOCK_RE.match(line)
+                kind = block.lastgroup if block else None
+            else:
+                kind = None
             
             # Check for headers (sections)
-            header_match = re.match(r'^(#{1,6})\s+(.+)$', line)
-            if header_match:
+            if kind == 'header':
                 # Close previous section at same or higher level
-                level = len(header_match.group(1))
-                title = header_match.group(2).strip()
+                level = len(block.group('hashes'))
+                title = block.group('title').strip()
                 
                 # Find where this section ends
-                section_end = self._find_section_end(lines, i, level)
-                
-                # Generate anchor
-                anchor_id = self._generate_anchor_id(title, i, "section")
-                section_content = '\n'.join(lines[i:section_end + 1])
+                section_end = section_ends[i]
                 
-                anchors[anchor_id] = {
-                    "line_start": i,
-                    "line_end": section_end,
-                    "type": "section",
-                    "title": title,
-                    "level": level,
-                    "content_hash": self._hash_content(section_content)[:16]
-                }
+                blocks.append((title, AnchorData(
+                    line_start=i,
+                    line_end=section_end,
+                    type="section",
+                    title=title,
+                    level=level
+                )))
                 
                 i += 1
                 continue
             
             # Check for code blocks
-            if line.startswith('```'):
-                code_end = self._find_code_block_end(lines, i)
+            if kind == 'fence':
+                # Closing fence: the next fence line, if any
+                j = bisect_right(fence_lines, i)
+                code_end = fence_lines[j] if j < len(fence_lines) else i
                 if code_end > i:
-                    lang = line[3:].strip() or "code"
-                    anchor_id = self._generate_anchor_id(f"code-{lang}", i, "code")
-                    code_content = '\n'.join(lines[i:code_end + 1])
+                    lang = block.group('lang').strip() or "code"
                     
-                    anchors[anchor_id] = {
-                        "line_start": i,
-                        "line_end": code_end,
-                        "type": "code",
-                        "title": f"Code block ({lang})",
-                        "content_hash": self._hash_content(code_content)[:16]
-                    }
+                    blocks.append((f"code-{lang}", AnchorData(
+                        line_start=i,
+                        line_end=code_end,
+                        type="code",
+                        title=f"Code block ({lang})"
+                    )))
                     
                     i = code_end + 1
                     continue
             
             # Check for tables
-            if '|' in line and i + 1 < len(lines) and re.match(r'^[\s|:-]+$', lines[i + 1]):
-                table_end = self._find_table_end(lines, i)
-                anchor_id = self._generate_anchor_id("table", i, "table")
-                table_content = '\n'.join(lines[i:table_end + 1])
+            if '|' in line and i + 1 < n_lines and _TABLE_SEP_RE.match(lines[i + 1]):
+                table_end = _block_end(_TABLE_BREAK_RE, markdown, line_starts, i)
                 
-                anchors[anchor_id] = {
-                    "line_start": i,
-                    "line_end": table_end,
-                    "type": "table",
-                    "title": "Table",
-                    "content_hash": self._hash_content(table_content)[:16]
-                }
+                blocks.append(("table", AnchorData(
+                    line_start=i,
+                    line_end=table_end,
+                    type="table",
+                    title="Table"
+                )))
                 
                 i = table_end + 1
                 continue
             
             # Check for lists (only if include_paragraphs)
-            if self.include_paragraphs and re.match(r'^[\s]*[-*+]\s', line):
-                list_end = self._find_list_end(lines, i)
-                anchor_id = self._generate_anchor_id("list", i, "list")
-                list_content = '\n'.join(lines[i:list_end + 1])
+            if self.include_paragraphs and kind == 'item':
+                list_end = _block_end(_LIST_BREAK_RE, markdown, line_starts, i)
                 
-                anchors[anchor_id] = {
-                    "line_start": i,
-                    "line_end": list_end,
-                    "type": "list",
-                    "title": "List",
-                    "content_hash": self._hash_content(list_content)[:16]
-                }
+                blocks.append(("list", AnchorData(
+                    line_start=i,
+                    line_end=list_end,
+                    type="list",
+                    title="List"
+                )))
                 
                 i = list_end + 1
                 continue
             
             # Check for paragraphs (only if include_paragraphs)
             if self.include_paragraphs and line.strip() and not line.startswith('#'):
-                para_end = self._find_paragraph_end(lines, i)
+                para_end = _block_end(_PARAGRAPH_BREAK_RE, markdown, line_starts, i)
                 if para_end > i:  # Multi-line paragraph
                     para_content = '\n'.join(lines[i:para_end + 1])
                     # Only anchor substantial paragraphs
                     if len(para_content) > 100:
-                        anchor_id = self._generate_anchor_id("para", i, "paragraph")
-                        
-                        anchors[anchor_id] = {
-                            "line_start": i,
-                            "line_end": para_end,
-                            "type": "paragraph",
-                            "title": para_content[:50] + "...",
-                            "content_hash": self._hash_content(para_content)[:16]
-                        }
+                        blocks.append(("para", AnchorData(
+                            line_start=i,
+                            line_end=para_end,
+                            type="paragraph",
+                            title=para_content[:50] + "..."
+                        )))
                 
                 i = para_end + 1
                 continue
             
             i += 1
         
+        # Pass 2 hashes every block's bytes in one batch: the markdown is
+        # encoded once and each block is a slice of that buffer
+        buf = memoryview(markdown.encode())
+        offsets = _line_offsets(buf.obj)
+        digests = _hash_ranges(buf, [
+            (offsets[anchor.line_start], offsets[anchor.line_end + 1] - 1)
+            for _, anchor in blocks
+        ])
+        
+        anchors = {}
+        for (seed, anchor), digest in zip(blocks, digests):
+            anchor.content_hash = digest[:16]
+            anchor_id = self._generate_anchor_id(seed, anchor.line_start, anchor.type)
+            anchors[anchor_id] = anchor
+        
         return anchors
     
     def _generate_anchor_id(self, title: str, line_num: int, anchor_type: str) -> str:
@@ -180,68 +367,18 @@ class AnchorGenerator:
         
         Format: anchor-{slug}-{hash8}
         """
-        # Create slug from title
-        slug = re.sub(r'[^a-z0-9]+', '-', title.lower())
-        slug = slug.strip('-')[:20]
-        
-        # Create hash for uniqueness
-        content = f"{title}:{line_num}:{anchor_type}"
-        hash_prefix = hashlib.sha256(content.encode()).hexdigest()[:8]
+        # Slug from title, and a hash of f"{title}:{line_num}:{anchor_type}"
+        # for uniqueness (resumed from the cached title prefix)
+        slug, prefix = _id_seed(title)
+        h = prefix.copy()
+        h.update(f"{line_num}:{anchor_type}".encode())
+        hash_prefix = h.hexdigest()
         
         return f"anchor-{slug}-{hash_prefix}"
     
     def _hash_content(self, content: str) -> str:
         """Generate SHA256 hash of content."""
         return hashlib.sha256(content.encode()).hexdigest()
-    
-    def _find_section_end(self, lines: list[str], start: int, level: int) -> int:
-        """Find where a section ends (next header of same/higher level or EOF)."""
-        for i in range(start + 1, len(lines)):
-            header_match = re.match(r'^(#{1,6})\s+', lines[i])
-            if header_match:
-                next_level = len(header_match.group(1))
-                if next_level <= level:
-                    return i - 1
-        return len(lines) - 1
-    
-    def _find_code_block_end(self, lines: list[str], start: int) -> int:
-        """Find the closing ``` of a code block."""
-        for i in range(start + 1, len(lines)):
-            if lines[i].startswith('```'):
-                return i
-        return start  # Unclosed code block
-    
-    def _find_table_end(self, lines: list[str], start: int) -> int:
-        """Find where a table ends."""
-        for i in range(start + 1, len(lines)):
-            if '|' not in lines[i]:
-                return i - 1
-        return len(lines) - 1
-    
-    def _find_list_end(self, lines: list[str], start: int) -> int:
-        """Find where a list ends."""
-        for i in range(start + 1, len(lines)):
-            line = lines[i]
-            # List continues if line is list item or indented continuation
-            if not (re.match(r'^[\s]*[-*+]\s', line) or 
-                    re.match(r'^[\s]{2,}', line) or
-                    re.match(r'^[\s]*\d+\.\s', line)):
-                if line.strip():  # Non-empty, non-list line
-                    return i - 1
-        return len(lines) - 1
-    
-    def _find_paragraph_end(self, lines: list[str], start: int) -> int:
-        """Find where a paragraph ends (blank line or special element)."""
-        for i in range(start + 1, len(lines)):
-            line = lines[i]
-            # Paragraph ends at blank line or special element
-            if not line.strip():
-                return i - 1
-            if line.startswith('#') or line.startswith('```') or line.startswith('|'):
-                return i - 1
-            if re.match(r'^[\s]*[-*+]\s', line):
-                return i - 1
-        return len(lines) - 1
 
 
 def inject_anchor_ids(markdown: str, anchors: dict[str, dict]) -> str:
@@ -258,18 +395,19 @@ def inject_anchor_ids(markdown: str, anchors: dict[str, dict]) -> str:
         Markdown with injected anchor spans
     """
     lines = markdown.split('\n')
+    n_lines = len(lines)
     
-    # Sort anchors by line number (descending) to avoid offset issues
-    sorted_anchors = sorted(
-        anchors.items(),
-        key=lambda x: x[1]["line_start"],
-        reverse=True
-    )
-    
-    for anchor_id, anchor_data in sorted_anchors:
+    # Group span tags by line in one pass; anchors sharing a line end up in
+    # reverse dict order, as when each was prepended in turn
+    spans: dict[int, list[str]] = {}
+    for anchor_id, anchor_data in anchors.items():
         line_num = anchor_data["line_start"]
-        if 0 <= line_num < len(lines):
-            # Inject anchor span at the start of the line
-            lines[line_num] = f'<span id="{anchor_id}"></span>{lines[line_num]}'
+        if 0 <= line_num < n_lines:
+            spans.setdefault(line_num, []).append(f'<span id="{anchor_id}"></span>')
+    
+    for line_num, tags in spans.items():
+        tags.reverse()
+        tags.append(lines[line_num])
+        lines[line_num] = ''.join(tags)
     
     return '\n'.join(lines)
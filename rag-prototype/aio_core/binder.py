@@ -12,18 +12,219 @@ section of narrative it came from. This creates a verifiable link between
 structured facts and their source context.
 """
 
+from bisect import bisect_left, bisect_right
+from collections import Counter
 from dataclasses import dataclass
-from typing import Optional
+from enum import Enum
+from typing import Optional, Union
+from .document_view import DocumentView, as_view
 from .structure_extractor import ExtractedEntity
 
 
+class BindingMethod(str, Enum):
+    """
+    How an entity was bound. Members compare equal to their string values;
+    serialized output (to_entity_list, reports) uses the plain values.
+    """
+    LINE_MATCH = "line_match"
+    CONTENT_MATCH = "content_match"
+    PROXIMITY = "proximity"
+    UNBOUND = "unbound"
+
+
 @dataclass
 class BoundEntity:
     """An entity with a verified link to its narrative source."""
+    __slots__ = ("entity", "anchor_ref", "binding_confidence", "binding_method")
+    
     entity: ExtractedEntity
     anchor_ref: Optional[str]
     binding_confidence: float
-    binding_method: str  # "line_match", "content_match", "proximity", "unbound"
+    binding_method: BindingMethod
+
+
+def _anchor_content(anchor_data: dict, lines: tuple[str, ...]) -> str:
+    """Narrative text covered by an anchor."""
+    return '\n'.join(lines[anchor_data["line_start"]:anchor_data["line_end"] + 1])
+
+
+class _AnchorText:
+    """
+    Substring tests against anchor text without materializing it.
+    
+    An anchor's lines joined with newlines are exactly a window of the
+    narrative, so "text in anchor content" becomes a bounded search of
+    the narrative itself. Anchors with negative line numbers (which slice
+    from the end) fall back to joining their lines.
+    """
+    
+    def __init__(self, anchors: dict[str, dict], view: DocumentView):
+        self.anchors = anchors
+        self.view = view
+        self.narrative = view.content
+        
+        offsets = view.line_offsets
+        n_lines = len(offsets) - 1
+        
+        windows: dict[str, Optional[tuple[int, int]]] = {}
+        for anchor_id, anchor_data in anchors.items():
+            start, end = anchor_data["line_start"], anchor_data["line_end"]
+            if start < 0 or end < 0:
+                windows[anchor_id] = None
+            elif start > min(end, n_lines - 1):
+                windows[anchor_id] = (0, 0)  # No lines: empty content
+            else:
+                end = min(end, n_lines - 1)
+                windows[anchor_id] = (offsets[start], offsets[end + 1] - 1)
+        self._windows = windows
+    
+    def _joined(self, anchor_id: str) -> str:
+        return _anchor_content(self.anchors[anchor_id], self.view.lines)
+    
+    def contains(self, anchor_id: str, text: str) -> bool:
+        """Whether text appears in the anchor's content."""
+        window = self._windows[anchor_id]
+        if window is None:
+            return text in self._joined(anchor_id)
+        return self.narrative.find(text, window[0], window[1]) != -1
+    
+    def first_containing(self, text: str) -> Optional[str]:
+        """First anchor (in dict order) whose content contains text."""
+        if not text:
+            return next(iter(self.anchors), None)
+        
+        # Every occurrence of text, found once; an anchor contains text iff
+        # the first occurrence at or after its window start ends inside it
+        positions = []
+        find = self.narrative.find
+        pos = find(text)
+        while pos != -1:
+            positions.append(pos)
+            pos = find(text, pos + 1)
+        
+        length = len(text)
+        for anchor_id, window in self._windows.items():
+            if window is None:
+                if text in self._joined(anchor_id):
+                    return anchor_id
+                continue
+            i = bisect_left(positions, window[0])
+            if i < len(positions) and positions[i] + length <= window[1]:
+                return anchor_id
+        return None
+
+
+class _AnchorIndex:
+    """
+    Line-range lookups over an anchor dict, built once per bind() call.
+    
+    - owner(line): the innermost anchor whose range contains the line
+      (smallest range; ties go to the first in dict order)
+    - nearest(line): the closest anchor by line distance, ties going to
+      the first in dict order (an inverted anchor, line_start > line_end,
+      owns no lines and is measured from its start for lines before it,
+      from its end otherwise)
+    - text: substring searches over anchor content (_AnchorText), built
+      on first use since most entities bind by line
+    """
+    
+    def __init__(self, anchors: dict[str, dict], view: DocumentView):
+        self.anchors = anchors
+        self.view = view
+        ids = list(anchors)
+        self._ids = ids
+        self._text: Optional[_AnchorText] = None
+        
+        # Paint each line with the innermost anchor covering it: anchors are
+        # painted smallest range first and a painted line is never repainted;
+        # skip[] jumps over painted lines, so painting is O(lines + anchors)
+        size = max(max((a["line_end"] + 1 for a in anchors.values()), default=0), 0)
+        owner: list[Optional[int]] = [None] * size
+        skip = list(range(size + 1))
+        
+        def next_free(j: int) -> int:
+            root = j
+            while skip[root] != root:
+                root = skip[root]
+            while skip[j] != root:
+                skip[j], j = root, skip[j]
+            return root
+        
+        values = list(anchors.values())
+        by_span = sorted(
+            range(len(values)),
+            key=lambda pos: (values[pos]["line_end"] - values[pos]["line_start"], pos)
+        )
+        for pos in by_span:
+            anchor = values[pos]
+            end = anchor["line_end"]
+            if anchor["line_start"] > end:
+                continue
+            j = next_free(max(anchor["line_start"], 0))
+            while j <= end:
+                owner[j] = pos
+                skip[j] = j + 1
+                j = next_free(j + 1)
+        self._owner = owner
+        
+        # Sorted distinct starts/ends, each with the first anchor that has it;
+        # inverted anchors don't fit the before/after split and are scanned
+        first_by_start: dict[int, int] = {}
+        first_by_end: dict[int, int] = {}
+        self._inverted: list[tuple[int, int, int]] = []  # (position, start, end)
+        for pos, anchor in enumerate(values):
+            if anchor["line_start"] > anchor["line_end"]:
+                self._inverted.append((pos, anchor["line_start"], anchor["line_end"]))
+                continue
+            first_by_start.setdefault(anchor["line_start"], pos)
+            first_by_end.setdefault(anchor["line_end"], pos)
+        self._starts = sorted(first_by_start)
+        self._start_pos = [first_by_start[k] for k in self._starts]
+        self._ends = sorted(first_by_end)
+        self._end_pos = [first_by_end[k] for k in self._ends]
+    
+    def owner(self, line: int) -> Optional[str]:
+        """Innermost anchor whose line range contains line."""
+        if 0 <= line < len(self._owner):
+            pos = self._owner[line]
+            if pos is not None:
+                return self._ids[pos]
+        return None
+    
+    def nearest(self, line: int) -> Optional[tuple[str, int]]:
+        """Nearest anchor to line and its distance (0 if inside one)."""
+        anchor_id = self.owner(line)
+        if anchor_id is not None:
+            return anchor_id, 0
+        
+        best: Optional[tuple[int, int]] = None  # (distance, position)
+        
+        # Closest anchor starting after the line
+        i = bisect_right(self._starts, line)
+        if i < len(self._starts):
+            best = (self._starts[i] - line, self._start_pos[i])
+        
+        # Closest anchor ending before the line
+        i = bisect_left(self._ends, line) - 1
+        if i >= 0:
+            candidate = (line - self._ends[i], self._end_pos[i])
+            if best is None or candidate < best:
+                best = candidate
+        
+        for pos, start, end in self._inverted:
+            candidate = (start - line if line < start else line - end, pos)
+            if best is None or candidate < best:
+                best = candidate
+        
+        if best is None:
+            return None
+        return self._ids[best[1]], best[0]
+    
+    @property
+    def text(self) -> _AnchorText:
+        if self._text is None:
+            self._text = _AnchorText(self.anchors, self.view)
+        return self._text
 
 
 class StructureBinder:
@@ -32,6 +233,7 @@ class StructureBinder:
     
     Binding strategies (in order of confidence):
     1. Line match: Entity's line_number falls within anchor's line range
+       (the innermost one when sections nest)
     2. Content match: Entity's source_text appears in anchor's content
     3. Proximity: Entity is near an anchor (lower confidence)
     4. Unbound: No suitable anchor found (flagged for review)
@@ -50,7 +252,7 @@ class StructureBinder:
         self,
         entities: list[ExtractedEntity],
         anchors: dict[str, dict],
-        narrative: str
+        narrative: Union[str, DocumentView]
     ) -> list[BoundEntity]:
         """
         Bind entities to their source anchors.
@@ -58,16 +260,16 @@ class StructureBinder:
         Args:
             entities: Extracted entities with line numbers
             anchors: Anchor dictionary from AnchorGenerator
-            narrative: Original markdown content
+            narrative: Original markdown content (or a DocumentView of it)
             
         Returns:
             List of bound entities with anchor references
         """
         bound_entities = []
-        lines = narrative.split('\n')
+        index = _AnchorIndex(anchors, as_view(narrative))
         
         for entity in entities:
-            bound = self._bind_entity(entity, anchors, lines)
+            bound = self._bind_entity(entity, index)
             bound_entities.append(bound)
         
         return bound_entities
@@ -75,36 +277,32 @@ class StructureBinder:
     def _bind_entity(
         self,
         entity: ExtractedEntity,
-        anchors: dict[str, dict],
-        lines: list[str]
+        index: _AnchorIndex
     ) -> BoundEntity:
         """Bind a single entity to an anchor."""
         
         # Strategy 1: Direct line match
-        for anchor_id, anchor_data in anchors.items():
-            if anchor_data["line_start"] <= entity.line_number <= anchor_data["line_end"]:
-                return BoundEntity(
-                    entity=entity,
-                    anchor_ref=f"#{anchor_id}",
-                    binding_confidence=1.0,
-                    binding_method="line_match"
-                )
+        anchor_id = index.owner(entity.line_number)
+        if anchor_id is not None:
+            return BoundEntity(
+                entity=entity,
+                anchor_ref=f"#{anchor_id}",
+                binding_confidence=1.0,
+                binding_method=BindingMethod.LINE_MATCH
+            )
         
         # Strategy 2: Content match (source_text appears in anchor content)
-        for anchor_id, anchor_data in anchors.items():
-            anchor_content = '\n'.join(
-                lines[anchor_data["line_start"]:anchor_data["line_end"] + 1]
+        anchor_id = index.text.first_containing(entity.source_text)
+        if anchor_id is not None:
+            return BoundEntity(
+                entity=entity,
+                anchor_ref=f"#{anchor_id}",
+                binding_confidence=0.9,
+                binding_method=BindingMethod.CONTENT_MATCH
             )
-            if entity.source_text in anchor_content:
-                return BoundEntity(
-                    entity=entity,
-                    anchor_ref=f"#{anchor_id}",
-                    binding_confidence=0.9,
-                    binding_method="content_match"
-                )
         
         # Strategy 3: Proximity (find nearest anchor)
-        nearest_anchor = self._find_nearest_anchor(entity.line_number, anchors)
+        nearest_anchor = index.nearest(entity.line_number)
         if nearest_anchor:
             anchor_id, distance = nearest_anchor
             if distance <= self.proximity_threshold:
@@ -114,7 +312,7 @@ class StructureBinder:
                     entity=entity,
                     anchor_ref=f"#{anchor_id}",
                     binding_confidence=confidence,
-                    binding_method="proximity"
+                    binding_method=BindingMethod.PROXIMITY
                 )
         
         # Strategy 4: Unbound (no suitable anchor)
@@ -122,33 +320,9 @@ class StructureBinder:
             entity=entity,
             anchor_ref=None,
             binding_confidence=0.0,
-            binding_method="unbound"
+            binding_method=BindingMethod.UNBOUND
         )
     
-    def _find_nearest_anchor(
-        self,
-        line_number: int,
-        anchors: dict[str, dict]
-    ) -> Optional[tuple[str, int]]:
-        """Find the anchor nearest to a line number."""
-        nearest = None
-        min_distance = float('inf')
-        
-        for anchor_id, anchor_data in anchors.items():
-            # Distance to anchor range
-            if line_number < anchor_data["line_start"]:
-                distance = anchor_data["line_start"] - line_number
-            elif line_number > anchor_data["line_end"]:
-                distance = line_number - anchor_data["line_end"]
-            else:
-                distance = 0  # Inside anchor
-            
-            if distance < min_distance:
-                min_distance = distance
-                nearest = (anchor_id, distance)
-        
-        return nearest
-    
     def to_entity_list(self, bound_entities: list[BoundEntity]) -> list[dict]:
         """
         Convert bound entities to a list suitable for the envelope.
@@ -159,10 +333,8 @@ class StructureBinder:
         Returns:
             List of entity dictionaries with anchor_ref
         """
-        result = []
-        
-        for bound in bound_entities:
-            entity_dict = {
+        return [
+            {
                 "@type": bound.entity.type,
                 **bound.entity.properties,
                 "anchor_ref": bound.anchor_ref,
@@ -170,12 +342,11 @@ class StructureBinder:
                 "_source": {
                     "text": bound.entity.source_text,
                     "line": bound.entity.line_number,
-                    "method": bound.binding_method
+                    "method": bound.binding_method.value
                 }
             }
-            result.append(entity_dict)
-        
-        return result
+            for bound in bound_entities
+        ]
     
     def get_binding_report(self, bound_entities: list[BoundEntity]) -> dict:
         """
@@ -191,32 +362,26 @@ class StructureBinder:
         if total == 0:
             return {"total": 0, "bound": 0, "unbound": 0, "avg_confidence": 0}
         
-        methods = {}
-        confidences = []
-        unbound_count = 0
-        
-        for bound in bound_entities:
-            method = bound.binding_method
-            methods[method] = methods.get(method, 0) + 1
-            confidences.append(bound.binding_confidence)
-            
-            if bound.anchor_ref is None:
-                unbound_count += 1
+        # Single pass: method counts (in first-seen order), confidence sum
+        # and the unbound entities
+        methods = Counter(b.binding_method for b in bound_entities)
+        confidence_sum = sum(b.binding_confidence for b in bound_entities)
+        unbound = [
+            {
+                "type": b.entity.type,
+                "source_text": b.entity.source_text,
+                "line": b.entity.line_number
+            }
+            for b in bound_entities if b.anchor_ref is None
+        ]
         
         return {
             "total": total,
-            "bound": total - unbound_count,
-            "unbound": unbound_count,
-            "avg_confidence": sum(confidences) / len(confidences),
-            "by_method": methods,
-            "unbound_entities": [
-                {
-                    "type": b.entity.type,
-                    "source_text": b.entity.source_text,
-                    "line": b.entity.line_number
-                }
-                for b in bound_entities if b.anchor_ref is None
-            ]
+            "bound": total - len(unbound),
+            "unbound": len(unbound),
+            "avg_confidence": confidence_sum / total,
+            "by_method": {method.value: count for method, count in methods.items()},
+            "unbound_entities": unbound
         }
 
 
@@ -234,7 +399,7 @@ class CrossLayerValidator:
         self,
         bound_entities: list[BoundEntity],
         anchors: dict[str, dict],
-        narrative: str
+        narrative: Union[str, DocumentView]
     ) -> dict:
         """
         Validate cross-layer consistency.
@@ -243,7 +408,7 @@ class CrossLayerValidator:
             Validation report with issues found
         """
         issues = []
-        lines = narrative.split('\n')
+        anchor_text = _AnchorText(anchors, as_view(narrative))
         
         # Check 1: All anchor_refs point to valid anchors
         for bound in bound_entities:
@@ -259,14 +424,10 @@ class CrossLayerValidator:
         
         # Check 2: Verify source_text appears in referenced anchor
         for bound in bound_entities:
-            if bound.anchor_ref and bound.binding_method != "proximity":
+            if bound.anchor_ref and bound.binding_method != BindingMethod.PROXIMITY:
                 anchor_id = bound.anchor_ref.lstrip('#')
                 if anchor_id in anchors:
-                    anchor_data = anchors[anchor_id]
-                    anchor_content = '\n'.join(
-                        lines[anchor_data["line_start"]:anchor_data["line_end"] + 1]
-                    )
-                    if bound.entity.source_text not in anchor_content:
+                    if not anchor_text.contains(anchor_id, bound.entity.source_text):
                         issues.append({
                             "type": "content_mismatch",
                             "entity_type": bound.entity.type,
@@ -0,0 +1,43 @@
+"""
+Document View - One pre-split view of a markdown document, shared by stages.
+
+Anchor generation, structure extraction, binding and validation all work
+line by line on the same narrative. The pipeline builds a DocumentView once
+and hands it to every stage, instead of each stage re-splitting the text.
+Every stage still accepts a plain string.
+"""
+
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Union
+
+
+@dataclass(frozen=True)
+class DocumentView:
+    """Markdown content with its lines, split on '\\n' once."""
+    content: str
+    lines: tuple[str, ...] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, "lines", tuple(self.content.split('\n')))
+    
+    @cached_property
+    def line_offsets(self) -> list[int]:
+        """
+        Character offset of the start of each line.
+        
+        A final entry of len(content) + 1 stands for the start of a virtual
+        line after the last one, so line i spans
+        content[offsets[i]:offsets[i + 1] - 1].
+        """
+        offsets = [0]
+        for line in self.lines:
+            offsets.append(offsets[-1] + len(line) + 1)
+        return offsets
+
+
+def as_view(document: Union[str, DocumentView]) -> DocumentView:
+    """Return document as a DocumentView, wrapping plain strings."""
+    if isinstance(document, DocumentView):
+        return document
+    return DocumentView(document)
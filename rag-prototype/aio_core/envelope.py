@@ -10,10 +10,47 @@ The envelope contains synchronized views of the same content:
 
 import hashlib
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cached_property
 from typing import Optional
 
+from .document_view import DocumentView
+
+# Optional: orjson serializes large envelopes several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Narratives at least this long are hashed on worker threads by
+# EnvelopeBuilder.build_many (hashlib releases the GIL on large buffers)
+PARALLEL_HASH_MIN_SIZE = 64 * 1024
+
+# Canonical encoding of entity properties for the structure hash
+_STRUCTURE_ENCODER = json.JSONEncoder(sort_keys=True)
+
+
+def _structure_hash(entities: list["Entity"]) -> str:
+    """
+    SHA256 of json.dumps([e.properties ...], sort_keys=True), streamed.
+    
+    Each entity is encoded and fed to the hasher on its own, with the list
+    punctuation json.dumps would emit between them, so the digest matches
+    the one-shot form without building the whole JSON string.
+    """
+    h = hashlib.sha256(b'[')
+    encode = _STRUCTURE_ENCODER.encode
+    separator = b''
+    for entity in entities:
+        h.update(separator)
+        h.update(encode(entity.properties).encode())
+        separator = b', '
+    h.update(b']')
+    return h.hexdigest()
+
 
 @dataclass
 class Source:
@@ -23,13 +60,39 @@ class Source:
     fetched_at: str = field(default_factory=lambda: datetime.utcnow().isoformat() + "Z")
 
 
-@dataclass
+@dataclass(frozen=True)
 class Narrative:
-    """Clean, noise-free content representation."""
+    """
+    Clean, noise-free content representation.
+    
+    Immutable: the content digest is computed once (on first use) and
+    cached, so a changed narrative means building a new Narrative.
+    """
     format: str  # markdown, plaintext
     content: str
     token_count: int = 0
     noise_score: float = 0.0  # 0 = no noise removed, 1 = all noise
+    _sha256: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def sha256(self) -> str:
+        """SHA256 hex digest of the UTF-8 content."""
+        digest = self._sha256
+        if digest is None:
+            digest = hashlib.sha256(self.content.encode('utf-8')).hexdigest()
+            object.__setattr__(self, "_sha256", digest)
+        return digest
+    
+    @cached_property
+    def view(self) -> DocumentView:
+        """The content split into lines, built on first section lookup."""
+        return DocumentView(self.content)
+    
+    def __getstate__(self):
+        # The view is derived from content; don't ship it when pickling
+        state = self.__dict__.copy()
+        state.pop("view", None)
+        return state
 
 
 @dataclass
@@ -118,8 +181,17 @@ class Envelope:
             }
         }
     
-    def to_json(self, indent: int = 2) -> str:
-        """Serialize to JSON string."""
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """
+        Serialize to JSON string.
+        
+        Uses orjson when installed for the layouts it supports (indent 2 or
+        compact); non-ASCII text is then emitted as UTF-8 instead of \\u
+        escapes, which decodes to the same data.
+        """
+        if orjson is not None and indent in (None, 2):
+            option = orjson.OPT_INDENT_2 if indent == 2 else 0
+            return orjson.dumps(self.to_dict(), option=option).decode('utf-8')
         return json.dumps(self.to_dict(), indent=indent)
     
     def get_section_by_anchor(self, anchor_id: str) -> Optional[str]:
@@ -129,7 +201,7 @@ class Envelope:
             return None
         
         anchor = self.anchors[anchor_id]
-        lines = self.narrative.content.split('\n')
+        lines = self.narrative.view.lines
         section_lines = lines[anchor.line_start:anchor.line_end + 1]
         return '\n'.join(section_lines)
     
@@ -140,7 +212,7 @@ class Envelope:
     
     def verify_integrity(self) -> bool:
         """Verify the narrative hash matches content."""
-        computed_hash = f"sha256:{hashlib.sha256(self.narrative.content.encode()).hexdigest()}"
+        computed_hash = f"sha256:{self.narrative.sha256}"
         return computed_hash == self.integrity.narrative_hash
 
 
@@ -212,15 +284,16 @@ class EnvelopeBuilder:
         if not self._narrative:
             raise ValueError("Narrative is required")
         
+        # One digest of the narrative serves both the ID and the integrity hash
+        narrative_digest = self._narrative.sha256
+        
         # Generate ID from content hash
-        content_hash = hashlib.sha256(self._narrative.content.encode()).hexdigest()[:8]
-        envelope_id = f"doc-{content_hash}"
+        envelope_id = f"doc-{narrative_digest[:8]}"
         
         # Generate integrity hashes
-        narrative_hash = f"sha256:{hashlib.sha256(self._narrative.content.encode()).hexdigest()}"
+        narrative_hash = f"sha256:{narrative_digest}"
         
-        structure_content = json.dumps([e.properties for e in self._entities], sort_keys=True)
-        structure_hash = f"sha256:{hashlib.sha256(structure_content.encode()).hexdigest()}"
+        structure_hash = f"sha256:{_structure_hash(self._entities)}"
         
         integrity = Integrity(
             narrative_hash=narrative_hash,
@@ -235,3 +308,31 @@ class EnvelopeBuilder:
             entities=self._entities,
             integrity=integrity
         )
+    
+    @staticmethod
+    def build_many(
+        builders: list["EnvelopeBuilder"],
+        max_workers: Optional[int] = None
+    ) -> list[Envelope]:
+        """
+        Build several envelopes, hashing large narratives in parallel.
+        
+        Narratives of PARALLEL_HASH_MIN_SIZE characters or more are hashed
+        on a thread pool first (max_workers defaults to os.cpu_count(),
+        ideally the number of physical cores); smaller ones are hashed
+        inline by build(), where a thread hop would cost more than it saves.
+        
+        Returns:
+            Envelopes in the same order as builders
+        """
+        large = [
+            b._narrative for b in builders
+            if b._narrative is not None
+            and b._narrative._sha256 is None
+            and len(b._narrative.content) >= PARALLEL_HASH_MIN_SIZE
+        ]
+        if len(large) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+                for _ in pool.map(lambda narrative: narrative.sha256, large):
+                    pass
+        return [b.build() for b in builders]
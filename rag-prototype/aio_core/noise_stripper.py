@@ -12,22 +12,89 @@ is wasted on navigation menus and cookie banners.
 
 import re
 from dataclasses import dataclass
+from html import unescape
 from typing import Optional
 
 # Optional: use these if available, fall back to regex if not
 try:
-    from bs4 import BeautifulSoup
+    from bs4 import BeautifulSoup, Tag
     HAS_BS4 = True
 except ImportError:
     HAS_BS4 = False
 
+# lxml is a C parser, several times faster than the stdlib html.parser
 try:
-    from markdownify import markdownify
+    import lxml  # noqa: F401
+    _BS4_PARSER = 'lxml'
+except ImportError:
+    _BS4_PARSER = 'html.parser'
+
+try:
+    from markdownify import MarkdownConverter
     HAS_MARKDOWNIFY = True
 except ImportError:
     HAS_MARKDOWNIFY = False
 
 
+def _markdownify_converts_tags() -> bool:
+    """
+    Whether convert_soup(tag) converts the tag itself (markdownify >= 1.0).
+    
+    Older releases convert only its children, dropping e.g. the tag's own
+    heading or code fence.
+    """
+    try:
+        from importlib.metadata import version
+        return int(version('markdownify').split('.')[0]) >= 1
+    except Exception:
+        return False
+
+
+_CONVERT_SOUP_TAGS = HAS_MARKDOWNIFY and _markdownify_converts_tags()
+
+
+# Patterns compiled once at import; re's own cache is small enough that the
+# ~20 patterns used per document would otherwise keep evicting each other
+_SCRIPT_RE = re.compile(r'<script[^>]*>.*?</script>', re.DOTALL | re.IGNORECASE)
+_STYLE_RE = re.compile(r'<style[^>]*>.*?</style>', re.DOTALL | re.IGNORECASE)
+_COMMENT_RE = re.compile(r'<!--.*?-->', re.DOTALL)
+
+_HEADER_RE = re.compile(r'<h([1-6])[^>]*>(.*?)</h\1>', re.DOTALL | re.IGNORECASE)
+_PARA_RE = re.compile(r'<p[^>]*>(.*?)</p>', re.DOTALL | re.IGNORECASE)
+_BR_RE = re.compile(r'<br\s*/?>', re.IGNORECASE)
+_LI_RE = re.compile(r'<li[^>]*>(.*?)</li>', re.DOTALL | re.IGNORECASE)
+_BOLD_RE = re.compile(r'<(b|strong)[^>]*>(.*?)</\1>', re.DOTALL | re.IGNORECASE)
+_ITALIC_RE = re.compile(r'<(i|em)[^>]*>(.*?)</\1>', re.DOTALL | re.IGNORECASE)
+_TAG_STRIP_RE = re.compile(r'<[^>]+>')
+
+_MAIN_CONTENT_RE = re.compile(r'content|main|article|post', re.I)
+
+# Text is word-counted in slices of this many characters
+WORD_COUNT_CHUNK_SIZE = 64 * 1024
+
+
+def _count_words(text: str) -> int:
+    """
+    Count whitespace-separated words, same as len(text.split()).
+    
+    Large texts are split one slice at a time, so only a slice's worth of
+    word strings is alive at once instead of one per word in the document.
+    A word cut by a slice boundary is counted in both slices and corrected.
+    """
+    if len(text) <= WORD_COUNT_CHUNK_SIZE:
+        return len(text.split())
+    
+    words = 0
+    ends_in_word = False
+    for start in range(0, len(text), WORD_COUNT_CHUNK_SIZE):
+        chunk = text[start:start + WORD_COUNT_CHUNK_SIZE]
+        words += len(chunk.split())
+        if ends_in_word and not chunk[0].isspace():
+            words -= 1
+        ends_in_word = not chunk[-1].isspace()
+    return words
+
+
 @dataclass
 class StrippedContent:
     """Result of noise stripping operation."""
@@ -106,10 +173,20 @@ class NoiseStripper:
             '|'.join(self.NOISE_PATTERNS), 
             re.IGNORECASE
         )
+        # Searched over the whole text at once, so whitespace in a pattern
+        # must not match across a line break
         self._boilerplate_pattern = re.compile(
-            '|'.join(self.BOILERPLATE_PATTERNS),
+            '|'.join(self.BOILERPLATE_PATTERNS).replace(r'\s', r'[^\S\n]'),
             re.IGNORECASE
         )
+        self._noise_tag_set = frozenset(self.NOISE_TAGS)
+        # One alternation for all noise tags, closed by a backreference
+        self._noise_tag_pattern = re.compile(
+            rf'<(?P<tag>{"|".join(self.NOISE_TAGS)})\b[^>]*>.*?</(?P=tag)>',
+            re.DOTALL | re.IGNORECASE
+        )
+        if HAS_MARKDOWNIFY:
+            self._markdown_converter = MarkdownConverter(heading_style="ATX", strip=['a'])
     
     def strip_html(self, html: str, source_url: Optional[str] = None) -> StrippedContent:
         """
@@ -125,21 +202,24 @@ class NoiseStripper:
         original_tokens = self._estimate_tokens(html)
         
         if HAS_BS4:
-            clean_html = self._strip_with_bs4(html)
+            main_content = self._strip_with_bs4(html)
         else:
-            clean_html = self._strip_with_regex(html)
+            main_content = self._strip_with_regex(html)
         
-        # Convert to markdown
+        # Convert to markdown. The parsed tree is handed to markdownify as-is;
+        # a single tag is only serialized and re-parsed on markdownify < 1.0
         if HAS_MARKDOWNIFY:
-            markdown = markdownify(clean_html, heading_style="ATX", strip=['a'])
+            if isinstance(main_content, str):
+                markdown = self._markdown_converter.convert(main_content)
+            elif _CONVERT_SOUP_TAGS or isinstance(main_content, BeautifulSoup):
+                markdown = self._markdown_converter.convert_soup(main_content)
+            else:
+                markdown = self._markdown_converter.convert(str(main_content))
         else:
-            markdown = self._html_to_markdown_simple(clean_html)
+            markdown = self._html_to_markdown_simple(str(main_content))
         
-        # Clean up the markdown
-        markdown = self._clean_markdown(markdown)
-        
-        # Remove boilerplate text patterns
-        markdown = self._remove_boilerplate(markdown)
+        # Clean up the markdown and remove boilerplate text patterns
+        markdown = self._finalize(markdown)
         
         final_tokens = self._estimate_tokens(markdown)
         tokens_removed = original_tokens - final_tokens
@@ -171,7 +251,11 @@ class NoiseStripper:
         # Normalize whitespace
         clean_text = self._normalize_whitespace(clean_text)
         
-        final_tokens = self._estimate_tokens(clean_text)
+        # Already-clean text (the common case for markdown input) keeps its count
+        if clean_text == text:
+            final_tokens = original_tokens
+        else:
+            final_tokens = self._estimate_tokens(clean_text)
         tokens_removed = original_tokens - final_tokens
         noise_score = tokens_removed / original_tokens if original_tokens > 0 else 0
         
@@ -183,49 +267,54 @@ class NoiseStripper:
             original_tokens=original_tokens
         )
     
-    def _strip_with_bs4(self, html: str) -> str:
-        """Use BeautifulSoup for robust HTML parsing."""
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Remove noise tags
-        for tag in self.NOISE_TAGS:
-            for element in soup.find_all(tag):
-                element.decompose()
-        
-        # Remove elements with noise class/id patterns
-        for element in soup.find_all(True):
-            classes = element.get('class', [])
-            element_id = element.get('id', '')
-            
-            class_str = ' '.join(classes) if isinstance(classes, list) else str(classes)
-            combined = f"{class_str} {element_id}"
-            
-            if self._noise_pattern.search(combined):
-                element.decompose()
+    def _strip_with_bs4(self, html: str) -> "Tag":
+        """Use BeautifulSoup for robust HTML parsing; returns the main content tag."""
+        soup = BeautifulSoup(html, _BS4_PARSER)
+        
+        # Remove noise tags and elements with noise class/id patterns in one
+        # tree walk; the soup is discarded afterwards, so extract() (which
+        # just unlinks the subtree) is enough
+        for element in soup.find_all(self._is_noise_element):
+            element.extract()
         
         # Try to find main content
         main_content = (
             soup.find('main') or 
             soup.find('article') or 
-            soup.find(class_=re.compile(r'content|main|article|post', re.I)) or
+            soup.find(class_=_MAIN_CONTENT_RE) or
             soup.find('body') or
             soup
         )
         
-        return str(main_content)
+        return main_content
+    
+    def _is_noise_element(self, element) -> bool:
+        """Whether a BS4 tag is a noise tag or has a noise class/id."""
+        if element.name in self._noise_tag_set:
+            return True
+        
+        classes = element.get('class', [])
+        element_id = element.get('id', '')
+        if not classes and not element_id:
+            return False
+        
+        class_str = ' '.join(classes) if isinstance(classes, list) else str(classes)
+        combined = f"{class_str} {element_id}"
+        
+        return self._noise_pattern.search(combined) is not None
     
     def _strip_with_regex(self, html: str) -> str:
         """Fallback regex-based HTML stripping."""
-        # Remove script and style tags with content
-        html = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL | re.IGNORECASE)
-        html = re.sub(r'<style[^>]*>.*?</style>', '', html, flags=re.DOTALL | re.IGNORECASE)
+        # Remove script and style tags with content (first, so a closing tag
+        # quoted inside a script can't end an enclosing noise element early)
+        html = _SCRIPT_RE.sub('', html)
+        html = _STYLE_RE.sub('', html)
         
-        # Remove noise tags
-        for tag in self.NOISE_TAGS:
-            html = re.sub(rf'<{tag}[^>]*>.*?</{tag}>', '', html, flags=re.DOTALL | re.IGNORECASE)
+        # Remove noise tags in a single pass
+        html = self._noise_tag_pattern.sub('', html)
         
         # Remove HTML comments
-        html = re.sub(r'<!--.*?-->', '', html, flags=re.DOTALL)
+        html = _COMMENT_RE.sub('', html)
         
         return html
     
@@ -234,68 +323,99 @@ class NoiseStripper:
         text = html
         
         # Convert headers
-        for i in range(6, 0, -1):
-            text = re.sub(rf'<h{i}[^>]*>(.*?)</h{i}>', r'\n' + '#' * i + r' \1\n', text, flags=re.DOTALL | re.IGNORECASE)
+        text = _HEADER_RE.sub(lambda m: f"\n{'#' * int(m.group(1))} {m.group(2)}\n", text)
         
         # Convert paragraphs
-        text = re.sub(r'<p[^>]*>(.*?)</p>', r'\n\1\n', text, flags=re.DOTALL | re.IGNORECASE)
+        text = _PARA_RE.sub(r'\n\1\n', text)
         
         # Convert line breaks
-        text = re.sub(r'<br\s*/?>', '\n', text, flags=re.IGNORECASE)
+        text = _BR_RE.sub('\n', text)
         
         # Convert lists
-        text = re.sub(r'<li[^>]*>(.*?)</li>', r'- \1\n', text, flags=re.DOTALL | re.IGNORECASE)
+        text = _LI_RE.sub(r'- \1\n', text)
         
         # Convert bold/strong
-        text = re.sub(r'<(b|strong)[^>]*>(.*?)</\1>', r'**\2**', text, flags=re.DOTALL | re.IGNORECASE)
+        text = _BOLD_RE.sub(r'**\2**', text)
         
         # Convert italic/em
-        text = re.sub(r'<(i|em)[^>]*>(.*?)</\1>', r'*\2*', text, flags=re.DOTALL | re.IGNORECASE)
+        text = _ITALIC_RE.sub(r'*\2*', text)
         
         # Remove remaining tags
-        text = re.sub(r'<[^>]+>', '', text)
+        text = _TAG_STRIP_RE.sub('', text)
         
-        # Decode common HTML entities
-        text = text.replace('&nbsp;', ' ')
-        text = text.replace('&amp;', '&')
-        text = text.replace('&lt;', '<')
-        text = text.replace('&gt;', '>')
-        text = text.replace('&quot;', '"')
-        text = text.replace('&#39;', "'")
+        # Decode HTML entities (named and numeric); non-breaking spaces
+        # become plain spaces
+        text = unescape(text).replace('\xa0', ' ')
         
         return text
     
-    def _clean_markdown(self, markdown: str) -> str:
-        """Clean up markdown formatting issues."""
-        # Remove excessive blank lines
-        markdown = re.sub(r'\n{3,}', '\n\n', markdown)
+    def _finalize(self, markdown: str) -> str:
+        """
+        Clean up markdown formatting issues and drop boilerplate lines.
         
-        # Remove leading/trailing whitespace from lines
-        lines = [line.strip() for line in markdown.split('\n')]
-        markdown = '\n'.join(lines)
+        A single pass over the lines: strip each line, blank out empty
+        headers, collapse runs of blank lines (and drop leading/trailing
+        ones), expand tabs, then skip short lines matching boilerplate.
+        Blank-line collapsing sees boilerplate lines as content, so the
+        spacing around a removed line is kept.
+        """
+        search = self._boilerplate_pattern.search
+        result = []
+        prev_blank = True
         
-        # Remove empty headers
-        markdown = re.sub(r'^#+\s*$', '', markdown, flags=re.MULTILINE)
+        for line in markdown.split('\n'):
+            line = line.strip()
+            
+            # Blank lines and empty headers; keep one blank line per run
+            if not line.strip('#'):
+                if prev_blank:
+                    continue
+                result.append('')
+                prev_blank = True
+                continue
+            prev_blank = False
+            
+            line = line.replace('\t', '    ')
+            
+            # Skip lines that are mostly boilerplate (only if the line is short)
+            if len(line) < 100 and search(line):
+                continue
+            result.append(line)
         
-        # Normalize whitespace
-        markdown = self._normalize_whitespace(markdown)
+        if prev_blank and result:
+            result.pop()
         
-        return markdown.strip()
+        return '\n'.join(result)
     
     def _remove_boilerplate(self, text: str) -> str:
         """Remove common boilerplate text patterns."""
-        lines = text.split('\n')
-        clean_lines = []
+        # One regex scan over the whole text finds the lines with
+        # boilerplate, instead of a search call per line
+        search = self._boilerplate_pattern.search
+        match = search(text)
+        if match is None:
+            return text
         
-        for line in lines:
-            # Skip lines that are mostly boilerplate
-            if self._boilerplate_pattern.search(line):
-                # Only skip if the line is short (likely just boilerplate)
-                if len(line) < 100:
-                    continue
-            clean_lines.append(line)
-        
-        return '\n'.join(clean_lines)
+        lines = text.split('\n')
+        skip = set()
+        line_no = 0
+        pos = 0
+        while match:
+            start = match.start()
+            line_no += text.count('\n', pos, start)
+            
+            # Only skip if the line is short (likely just boilerplate)
+            if len(lines[line_no]) < 100:
+                skip.add(line_no)
+            
+            # Resume at the next line; one hit per line is enough
+            pos = text.find('\n', start) + 1
+            if not pos:
+                break
+            line_no += 1
+            match = search(text, pos)
+        
+        return '\n'.join([line for i, line in enumerate(lines) if i not in skip])
     
     def _normalize_whitespace(self, text: str) -> str:
         """Normalize whitespace while preserving structure."""
@@ -320,5 +440,5 @@ class NoiseStripper:
     def _estimate_tokens(self, text: str) -> int:
         """Estimate token count from text."""
         # Simple word-based estimation
-        words = len(text.split())
+        words = _count_words(text)
         return int(words * self.tokens_per_word)
@@ -11,6 +11,7 @@ Usage:
 """
 
 from typing import Optional
+from .document_view import DocumentView
 from .envelope import Envelope, EnvelopeBuilder
 from .noise_stripper import NoiseStripper, StrippedContent
 from .anchor_generator import AnchorGenerator
@@ -115,19 +116,22 @@ class AIOPipeline:
     ) -> Envelope:
         """Internal processing of clean markdown."""
         
+        # Split the markdown once; every stage reads the same view
+        view = DocumentView(markdown)
+        
         # Step 2: Generate anchors
-        anchors = self.anchor_generator.generate(markdown)
+        anchors = self.anchor_generator.generate(view)
         
         # Step 3: Extract structured entities
-        entities = self.structure_extractor.extract(markdown)
+        entities = self.structure_extractor.extract(view)
         
         # Step 4: Bind entities to anchors
-        bound_entities = self.binder.bind(entities, anchors, markdown)
+        bound_entities = self.binder.bind(entities, anchors, view)
         
         # Step 5: Validate bindings (optional)
         validation_result = None
         if self.validator:
-            validation_result = self.validator.validate(bound_entities, anchors, markdown)
+            validation_result = self.validator.validate(bound_entities, anchors, view)
         
         # Step 6: Build envelope
         entity_list = self.binder.to_entity_list(bound_entities)
@@ -157,22 +161,23 @@ class AIOPipeline:
         """
         # Step 1: Strip noise
         stripped = self.noise_stripper.strip_html(html, source_url)
+        view = DocumentView(stripped.content)
         
         # Step 2: Generate anchors
-        anchors = self.anchor_generator.generate(stripped.content)
+        anchors = self.anchor_generator.generate(view)
         
         # Step 3: Extract entities
-        entities = self.structure_extractor.extract(stripped.content)
+        entities = self.structure_extractor.extract(view)
         
         # Step 4: Bind entities
-        bound_entities = self.binder.bind(entities, anchors, stripped.content)
+        bound_entities = self.binder.bind(entities, anchors, view)
         binding_report = self.binder.get_binding_report(bound_entities)
         
         # Step 5: Validate
         validation_result = None
         if self.validator:
             validation_result = self.validator.validate(
-                bound_entities, anchors, stripped.content
+                bound_entities, anchors, view
             )
         
         # Step 6: Build envelope
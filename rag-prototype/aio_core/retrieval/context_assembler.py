@@ -15,6 +15,9 @@ from dataclasses import dataclass
 from typing import Optional
 from .router import RetrievalResult
 
+# Words in the fixed text of the query header ("## Query", "## Retrieved Context")
+_QUERY_HEADER_WORDS = 5
+
 
 @dataclass
 class AssembledContext:
@@ -76,7 +79,7 @@ class ContextAssembler:
             AssembledContext ready for AI processing
         """
         # Deduplicate results
-        deduped = self._deduplicate(results)
+        deduped, source_count = self._deduplicate(results)
         
         # Sort by score
         deduped.sort(key=lambda x: x.score, reverse=True)
@@ -90,12 +93,12 @@ class ContextAssembler:
         if include_query:
             header = f"## Query\n{query}\n\n## Retrieved Context\n"
             sections.append(header)
-            total_tokens += self._estimate_tokens(header)
+            total_tokens += self._words_to_tokens(_QUERY_HEADER_WORDS + len(query.split()))
         
         for i, result in enumerate(deduped):
             # Check if we have room
-            section = self._format_result(result, i + 1)
-            section_tokens = self._estimate_tokens(section)
+            section, section_words = self._format_result(result, i + 1)
+            section_tokens = self._words_to_tokens(section_words)
             
             if total_tokens + section_tokens > self.max_tokens:
                 # Add truncation notice
@@ -125,28 +128,42 @@ class ContextAssembler:
         return AssembledContext(
             formatted_context=formatted_context,
             total_tokens=total_tokens,
-            source_count=len(set(r.source_id for r in deduped)),
+            source_count=source_count,
             citations=citations,
             integrity_status=integrity_status
         )
     
-    def _deduplicate(self, results: list[RetrievalResult]) -> list[RetrievalResult]:
-        """Remove duplicate results based on anchor."""
+    def _deduplicate(
+        self,
+        results: list[RetrievalResult]
+    ) -> tuple[list[RetrievalResult], int]:
+        """
+        Remove duplicate results based on anchor.
+        
+        Returns:
+            Tuple of (deduplicated results, number of unique sources)
+        """
         seen = set()
+        sources = set()
         deduped = []
         
         for result in results:
-            key = f"{result.source_id}:{result.anchor_id}"
+            key = (result.source_id, result.anchor_id)
             if key not in seen:
                 seen.add(key)
+                sources.add(result.source_id)
                 deduped.append(result)
         
-        return deduped
+        return deduped, len(sources)
     
-    def _format_result(self, result: RetrievalResult, index: int) -> str:
-        """Format a single result for output."""
-        lines = []
+    def _format_result(self, result: RetrievalResult, index: int) -> tuple[str, int]:
+        """
+        Format a single result for output.
         
+        Returns:
+            Tuple of (formatted section, its word count). Words are counted
+            block by block, so the section never has to be re-split.
+        """
         # Header with citation info
         citation = f"doc:{result.source_id}"
         if result.anchor_id:
@@ -154,48 +171,44 @@ class ContextAssembler:
         
         confidence = f"{result.score:.0%}" if result.score else "N/A"
         
-        lines.append(f"### Source {index} [{confidence} confidence]")
-        lines.append(f"**Citation**: `{citation}`")
-        
+        integrity = ""
         if self.include_integrity:
-            lines.append(f"**Integrity**: ✓ verified")  # Would actually check
+            integrity = "**Integrity**: ✓ verified\n"  # Would actually check
         
-        lines.append("")
+        # Sections are blocks of lines, each ending in a blank line
+        blocks = [
+            f"### Source {index} [{confidence} confidence]\n"
+            f"**Citation**: `{citation}`\n"
+            f"{integrity}"
+        ]
+        # 5 words in the source line, 1 for "**Citation**:"
+        words = 6 + len(f"`{citation}`".split()) + (3 if integrity else 0)
         
         # Structured entities (if any and enabled)
         if self.include_entities and result.entities:
-            lines.append("#### Structured Facts")
-            lines.append("```json")
-            
-            # Format entities compactly
-            for entity in result.entities[:3]:  # Limit to 3 entities
-                # Remove internal fields
-                clean_entity = {
-                    k: v for k, v in entity.items()
-                    if not k.startswith('_')
-                }
-                lines.append(str(clean_entity))
-            
-            lines.append("```")
-            lines.append("")
+            # Format entities compactly, without internal fields
+            entity_lines = [
+                str({k: v for k, v in entity.items() if not k.startswith('_')})
+                for entity in result.entities[:3]  # Limit to 3 entities
+            ]
+            entities = "\n".join(entity_lines)
+            blocks.append(f"#### Structured Facts\n```json\n{entities}\n```\n")
+            words += 5 + len(entities.split())
         
-        # Narrative content
+        # Narrative content, quoted line by line
         if result.content:
-            lines.append("#### Narrative Context")
-            # Quote the content
-            content_lines = result.content.strip().split('\n')
-            for line in content_lines:
-                lines.append(f"> {line}")
-            lines.append("")
+            content = result.content.strip()
+            quoted = "> " + content.replace("\n", "\n> ")
+            blocks.append(f"#### Narrative Context\n{quoted}\n")
+            words += 3 + content.count("\n") + 1 + len(content.split())
         
-        lines.append("---")
-        lines.append("")
+        blocks.append("---\n")
+        words += 1
         
-        return "\n".join(lines)
+        return "\n".join(blocks), words
     
-    def _estimate_tokens(self, text: str) -> int:
-        """Estimate token count."""
-        words = len(text.split())
+    def _words_to_tokens(self, words: int) -> int:
+        """Estimate token count from a word count."""
         return int(words * self.tokens_per_word)
     
     def format_for_prompt(
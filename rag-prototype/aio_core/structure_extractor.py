@@ -16,9 +16,11 @@ The extractor creates JSON-LD compatible entities that can be:
 
 import re
 from dataclasses import dataclass
-from typing import Optional, Any
+from typing import Optional, Any, Union
 from datetime import datetime
 
+from .document_view import DocumentView, as_view
+
 
 @dataclass
 class ExtractedEntity:
@@ -80,18 +82,19 @@ class StructureExtractor:
         self._url_pattern = re.compile(self.URL_PATTERN)
         self._version_pattern = re.compile(self.VERSION_PATTERN)
     
-    def extract(self, markdown: str) -> list[ExtractedEntity]:
+    def extract(self, markdown: Union[str, DocumentView]) -> list[ExtractedEntity]:
         """
         Extract all structured entities from markdown content.
         
         Args:
-            markdown: Clean markdown content
+            markdown: Clean markdown content (or a DocumentView of it)
             
         Returns:
             List of extracted entities with source references
         """
         entities = []
-        lines = markdown.split('\n')
+        view = as_view(markdown)
+        lines = view.lines
         
         for i, line in enumerate(lines):
             # Extract prices
@@ -110,7 +113,7 @@ class StructureExtractor:
             entities.extend(self._extract_versions(line, i))
         
         # Extract products (multi-line analysis)
-        entities.extend(self._extract_products(markdown, lines))
+        entities.extend(self._extract_products(view.content, lines))
         
         return entities
     
@@ -240,7 +243,7 @@ class StructureExtractor:
         
         return entities
     
-    def _extract_products(self, markdown: str, lines: list[str]) -> list[ExtractedEntity]:
+    def _extract_products(self, markdown: str, lines: tuple[str, ...]) -> list[ExtractedEntity]:
         """
         Extract product entities by analyzing content structure.
         
@@ -0,0 +1,31 @@
+"""
+Gunicorn configuration for the ECR API server.
+
+Usage (from rag-prototype/):
+    gunicorn aio_api.server:app
+
+Threaded workers with long keep-alive, so clients that reuse connections
+(n8n, LangChain, a requests.Session) skip a TCP/TLS handshake per call:
+
+    session = requests.Session()
+    for doc in docs:
+        session.post("http://localhost:5000/api/v1/process", json=doc)
+
+Configuration:
+- ECR_PORT: listen port (default 5000)
+- ECR_HTTP_WORKERS: worker processes (default: CPU count)
+- ECR_HTTP_THREADS: threads per worker (default 8)
+- ECR_WORKERS: pipeline processes per worker (see aio_api.workers)
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('ECR_PORT', 5000)}"
+workers = int(os.environ.get('ECR_HTTP_WORKERS', os.cpu_count() or 1))
+worker_class = "gthread"
+threads = int(os.environ.get('ECR_HTTP_THREADS', 8))
+keepalive = 75
+
+# Every HTTP worker starts its own pipeline pool; with one HTTP worker per
+# core, a CPU-count pool in each would oversubscribe the machine
+os.environ.setdefault('ECR_WORKERS', '2')
@@ -0,0 +1,169 @@
+"""
+Tests for the binder's line-range index (_AnchorIndex).
+
+owner() and nearest() are checked on hand-written layouts, then against a
+brute-force reference over random anchor sets, including inverted and
+out-of-range anchors.
+"""
+
+import random
+
+import pytest
+
+from aio_core.binder import StructureBinder, _AnchorIndex
+from aio_core.document_view import as_view
+from aio_core.structure_extractor import ExtractedEntity
+
+
+def _index(anchors: dict[str, tuple[int, int]], lines: int = 30) -> _AnchorIndex:
+    anchor_dict = {
+        anchor_id: {"line_start": start, "line_end": end}
+        for anchor_id, (start, end) in anchors.items()
+    }
+    return _AnchorIndex(anchor_dict, as_view("\n".join(["x"] * lines)))
+
+
+def _reference_owner(anchors: dict[str, dict], line: int):
+    """Innermost containing anchor: smallest range, then dict order."""
+    containing = [
+        (a["line_end"] - a["line_start"], pos, anchor_id)
+        for pos, (anchor_id, a) in enumerate(anchors.items())
+        if a["line_start"] <= line <= a["line_end"]
+    ]
+    return min(containing)[2] if containing else None
+
+
+def _reference_nearest(anchors: dict[str, dict], line: int):
+    """The binder's original linear proximity scan, after the owner check."""
+    owner = _reference_owner(anchors, line)
+    if owner is not None:
+        return owner, 0
+    nearest = None
+    min_distance = float("inf")
+    for anchor_id, a in anchors.items():
+        if line < a["line_start"]:
+            distance = a["line_start"] - line
+        elif line > a["line_end"]:
+            distance = line - a["line_end"]
+        else:
+            distance = 0
+        if distance < min_distance:
+            min_distance = distance
+            nearest = (anchor_id, distance)
+    return nearest
+
+
+def test_owner_picks_innermost_nested_section():
+    index = _index({
+        "chapter": (0, 20),
+        "section": (2, 10),
+        "subsection": (4, 6),
+        "later": (12, 15),
+    })
+
+    assert index.owner(0) == "chapter"
+    assert index.owner(3) == "section"
+    assert index.owner(5) == "subsection"
+    assert index.owner(6) == "subsection"
+    assert index.owner(7) == "section"
+    assert index.owner(13) == "later"
+    assert index.owner(20) == "chapter"
+    assert index.owner(21) is None
+
+
+def test_owner_ties_go_to_first_in_dict_order():
+    index = _index({"first": (3, 5), "second": (3, 5), "wide": (0, 9)})
+
+    assert index.owner(4) == "first"
+    assert index.nearest(4) == ("first", 0)
+
+
+def test_inverted_anchor_owns_no_lines():
+    index = _index({"inverted": (8, 2), "normal": (10, 12)})
+
+    for line in range(0, 10):
+        assert index.owner(line) is None
+    # Measured from its start before it, from its end after that
+    assert index.nearest(1) == ("inverted", 7)
+    assert index.nearest(5) == ("inverted", 3)
+    assert index.nearest(9) == ("normal", 1)
+
+
+def test_inverted_anchor_past_the_last_line():
+    # line_start beyond every line_end must not break the painting pass
+    index = _index({"inverted": (25, 3), "normal": (0, 1)})
+
+    assert index.owner(2) is None
+    assert index.nearest(2) == ("normal", 1)
+    assert index.nearest(27) == ("inverted", 24)
+
+
+def test_out_of_range_anchors():
+    index = _index({"before": (-5, 1), "beyond": (28, 40)}, lines=30)
+
+    assert index.owner(0) == "before"
+    assert index.owner(35) == "beyond"
+    assert index.owner(41) is None
+    assert index.nearest(3) == ("before", 2)
+    assert index.nearest(45) == ("beyond", 5)
+
+
+def test_nearest_ties_go_to_first_in_dict_order():
+    # Line 5 is two lines after "above" and two lines before "below"
+    index = _index({"below": (7, 9), "above": (0, 3)})
+    assert index.nearest(5) == ("below", 2)
+
+    index = _index({"above": (0, 3), "below": (7, 9)})
+    assert index.nearest(5) == ("above", 2)
+
+    # Two anchors starting on the same line
+    index = _index({"a": (10, 12), "b": (10, 11)})
+    assert index.nearest(8) == ("a", 2)
+
+
+def test_empty_anchor_dict():
+    index = _index({})
+
+    assert index.owner(0) is None
+    assert index.nearest(0) is None
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_reference(seed):
+    rng = random.Random(seed)
+    for _ in range(400):
+        lines = rng.randint(1, 30)
+        anchors = {}
+        for k in range(rng.randint(0, 8)):
+            start = rng.randint(-3, lines + 3)
+            anchors[f"a{k}"] = {
+                "line_start": start,
+                "line_end": start + rng.randint(-4, 12),  # may be inverted
+            }
+        index = _AnchorIndex(anchors, as_view("\n".join(["x"] * lines)))
+
+        for line in range(0, lines + 8):
+            assert index.owner(line) == _reference_owner(anchors, line)
+            assert index.nearest(line) == _reference_nearest(anchors, line)
+
+
+def test_bind_uses_innermost_anchor_and_proximity():
+    anchors = {
+        "chapter": {"line_start": 0, "line_end": 10},
+        "section": {"line_start": 2, "line_end": 5},
+    }
+    entities = [
+        ExtractedEntity(type="PriceSpecification", properties={}, source_text="$5",
+                        line_number=3),
+        ExtractedEntity(type="PriceSpecification", properties={}, source_text="$7",
+                        line_number=13),
+    ]
+
+    bound = StructureBinder(proximity_threshold=5).bind(
+        entities, anchors, "\n".join(["x"] * 20)
+    )
+
+    assert bound[0].anchor_ref == "#section"
+    assert bound[0].binding_confidence == 1.0
+    assert bound[1].anchor_ref == "#chapter"
+    assert bound[1].binding_confidence == pytest.approx(0.65)